@@ -18,6 +18,13 @@ from typing import List, Dict, Tuple
 import sys
 import os
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    # NumPy is optional - traffic jam detection falls back to a Python loop
+    NUMPY_AVAILABLE = False
+
 # Add src to path
 sys.path.insert(0, os.path.dirname(__file__))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -128,6 +135,10 @@ class CityVANETSimulator:
             'inter_cluster_messages': 0
         }
         
+        # Insertion rank of each vehicle while V2V messages are exchanged (None
+        # otherwise); range queries then use the application's position store
+        self._v2v_order = None
+        
         # Create city road network
         self.setup_city_network()
         
@@ -410,19 +421,10 @@ class CityVANETSimulator:
         sender_x, sender_y = sender_node.location
         
         # Find direct recipients (within communication range)
-        direct_recipients = []
-        for vehicle_id, node in self.app.vehicle_nodes.items():
-            if vehicle_id == sender_id:
-                continue
-            
-            x, y = node.location
-            distance = math.sqrt((x - sender_x)**2 + (y - sender_y)**2)
-            
-            if distance <= self.communication_range:
-                direct_recipients.append(vehicle_id)
-                
-                # Process message at recipient
-                self._handle_v2v_message(vehicle_id, sender_id, message_type, data, current_time)
+        direct_recipients = self._vehicles_within(sender_x, sender_y, self.communication_range, sender_id)
+        for vehicle_id in direct_recipients:
+            # Process message at recipient
+            self._handle_v2v_message(vehicle_id, sender_id, message_type, data, current_time)
         
         # Multi-hop relay for cluster members
         relayed_recipients = []
@@ -510,7 +512,7 @@ class CityVANETSimulator:
         
         sender_cluster = self.app.clustering_engine.clusters[sender_cluster_id]
         
-        if not hasattr(sender_cluster, 'boundary_nodes') or not sender_cluster.boundary_nodes:
+        if not sender_cluster.boundary_nodes:
             # No boundary nodes elected yet
             return []
         
@@ -529,7 +531,7 @@ class CityVANETSimulator:
             
             # Check if neighbor cluster also has a boundary node facing us
             neighbor_boundary_node_id = None
-            if hasattr(neighbor_cluster, 'boundary_nodes') and neighbor_cluster.boundary_nodes:
+            if neighbor_cluster.boundary_nodes:
                 neighbor_boundary_node_id = neighbor_cluster.boundary_nodes.get(sender_cluster_id)
             
             if neighbor_boundary_node_id and neighbor_boundary_node_id in self.app.vehicle_nodes:
@@ -582,10 +584,8 @@ class CityVANETSimulator:
         collision_risk = False
         
         # Check all nearby vehicles
-        for other_id, other_node in self.app.vehicle_nodes.items():
-            if other_id == vehicle_id:
-                continue
-            
+        for other_id in self._vehicles_within(x, y, 100, vehicle_id):
+            other_node = self.app.vehicle_nodes[other_id]
             other_config = self.vehicle_configs[other_id]
             other_x, other_y = other_node.location
             other_lane = other_config['current_lane']
@@ -593,9 +593,6 @@ class CityVANETSimulator:
             # Check current distance
             current_distance = math.sqrt((x - other_x)**2 + (y - other_y)**2)
             
-            if current_distance > 100:  # Only check nearby vehicles
-                continue
-            
             # Check if in same lane or changing to same lane
             same_lane = (my_lane == other_lane)
             my_changing = config['target_lane'] is not None
@@ -834,20 +831,22 @@ class CityVANETSimulator:
         ahead_x = x + look_ahead_distance * math.cos(math.radians(direction))
         ahead_y = y + look_ahead_distance * math.sin(math.radians(direction))
         
-        for other_id, other_node in self.app.vehicle_nodes.items():
-            if other_id == vehicle_id:
-                continue
-            
-            other_config = self.vehicle_configs[other_id]
+        # Only vehicles within the look-ahead distance can block, so fetch those
+        # once instead of reading every vehicle's config and position
+        vehicle_nodes = self.app.vehicle_nodes
+        vehicle_configs = self.vehicle_configs
+        for other_id in self._vehicles_within(x, y, look_ahead_distance, vehicle_id):
+            other_node = vehicle_nodes[other_id]
             other_x, other_y = other_node.location
             
             # Check if in same lane
-            if other_config['current_lane'] != my_lane:
+            if vehicle_configs[other_id]['current_lane'] != my_lane:
                 continue
             
-            # Check if ahead of us
-            dist_to_other = math.sqrt((other_x - x)**2 + (other_y - y)**2)
-            if dist_to_other > look_ahead_distance or dist_to_other < 5:
+            # Ignore vehicles right on top of us
+            dx = other_x - x
+            dy = other_y - y
+            if dx * dx + dy * dy < 25:
                 continue
             
             # Check if in our path (similar direction)
@@ -1032,7 +1031,7 @@ class CityVANETSimulator:
                             new_y = new_y * 0.7 + ideal_y * 0.3
                         
                         # Apply lane offset perpendicular to road direction (limited to ±10 pixels)
-                        if hasattr(node, 'lane_offset') and abs(node.lane_offset) > 0.1:
+                        if abs(node.lane_offset) > 0.1:
                             # Limit lane offset to prevent vehicles from going too far off road
                             limited_offset = max(-10, min(10, node.lane_offset))
                             
@@ -1103,8 +1102,7 @@ class CityVANETSimulator:
                 if node.sleeper_activated and random.random() < 0.15:
                     # More aggressive malicious behavior than regular attackers
                     node.speed = min(90, node.speed + random.uniform(15, 35))
-                    if hasattr(node, 'erratic_behavior_count'):
-                        node.erratic_behavior_count += 1
+                    node.erratic_behavior_count += 1
                     # Rapid trust degradation
                     node.trust_score = max(0.05, node.trust_score * 0.90)
             
@@ -1112,19 +1110,49 @@ class CityVANETSimulator:
             elif config['is_malicious'] and random.random() < 0.1:
                 # Erratic speed changes
                 node.speed = min(85, node.speed + random.uniform(10, 30))
-                if hasattr(node, 'erratic_behavior_count'):
-                    node.erratic_behavior_count += 1
+                node.erratic_behavior_count += 1
                 # Degrade trust over time for malicious behavior
                 node.trust_score = max(0.05, node.trust_score * 0.95)
         
         # V2V COMMUNICATION - Process after all position updates
         self._process_v2v_communications(current_time)
     
+    def _vehicles_within(self, x: float, y: float, radius: float, exclude: str) -> List[str]:
+        """IDs of vehicles within radius of (x, y), in vehicle insertion order"""
+        order = self._v2v_order
+        if order is not None:
+            nearby = self.app.vehicle_store.neighbor_ids_within(x, y, radius, exclude=exclude)
+            nearby.sort(key=order.__getitem__)
+            return nearby
+        
+        # Outside the V2V phase positions may be mid-update, so scan the nodes
+        radius_sq = radius * radius
+        nearby = []
+        for vehicle_id, node in self.app.vehicle_nodes.items():
+            if vehicle_id == exclude:
+                continue
+            dx = node.location[0] - x
+            dy = node.location[1] - y
+            if dx * dx + dy * dy <= radius_sq:
+                nearby.append(vehicle_id)
+        return nearby
+    
     def _process_v2v_communications(self, current_time: float):
         """
         Process all V2V communications: collision detection, lane change alerts, 
         emergency broadcasts, brake warnings
         """
+        # Vehicles don't move while messages are exchanged, so sync the position
+        # store once and answer every range query in this phase from its grid
+        self.app.vehicle_store.sync(self.app.vehicle_nodes)
+        self._v2v_order = {vehicle_id: i for i, vehicle_id in enumerate(self.app.vehicle_nodes)}
+        try:
+            self._exchange_v2v_messages(current_time)
+        finally:
+            self._v2v_order = None
+    
+    def _exchange_v2v_messages(self, current_time: float):
+        """Run the collision, brake, emergency and traffic jam exchanges for one step"""
         # 1. Emergency vehicles broadcast alerts
         for vehicle_id, config in self.vehicle_configs.items():
             if config['is_emergency']:
@@ -1141,7 +1169,7 @@ class CityVANETSimulator:
         for vehicle_id, node in self.app.vehicle_nodes.items():
             if hasattr(node, 'speed'):
                 # If speed dropped significantly (hard brake)
-                if hasattr(node, 'prev_speed'):
+                if node.prev_speed is not None:
                     speed_drop = node.prev_speed - node.speed
                     if speed_drop > 10:  # Hard braking threshold
                         self.broadcast_v2v_message(
@@ -1187,16 +1215,32 @@ class CityVANETSimulator:
         
         # Simple clustering: find groups of slow vehicles
         clusters = []
-        for pos in slow_vehicles:
-            # Count nearby slow vehicles
-            nearby_count = sum(1 for other_pos in slow_vehicles 
-                             if math.sqrt((pos[0] - other_pos[0])**2 + 
-                                        (pos[1] - other_pos[1])**2) < 100)
+        for pos, nearby_count in zip(slow_vehicles, self._count_nearby(slow_vehicles, 100.0)):
             if nearby_count >= 5:
                 clusters.append((pos, nearby_count))
         
         return clusters
     
+    @staticmethod
+    def _count_nearby(positions: List[Tuple[float, float]], radius: float,
+                      block_size: int = 512) -> List[int]:
+        """For each position, count positions (itself included) closer than radius"""
+        radius_sq = radius * radius
+        if not NUMPY_AVAILABLE or not positions:
+            return [sum(1 for ox, oy in positions if (x - ox)**2 + (y - oy)**2 < radius_sq)
+                    for x, y in positions]
+        
+        # Squared distances against all positions, a block of rows at a time to
+        # keep the temporary matrix small
+        coords = np.asarray(positions, dtype=np.float64)
+        xs, ys = coords[:, 0], coords[:, 1]
+        counts = []
+        for start in range(0, len(coords), block_size):
+            block = coords[start:start + block_size]
+            dist_sq = (block[:, 0:1] - xs)**2 + (block[:, 1:2] - ys)**2
+            counts.extend(np.count_nonzero(dist_sq < radius_sq, axis=1).tolist())
+        return counts
+    
     def run_simulation(self):
         """Run full simulation with consensus-based cluster elections"""
         print(f"Initializing {self.num_vehicles} vehicles in city network...")
@@ -1433,11 +1477,6 @@ class CityVANETSimulator:
                     self._run_cluster_election(cluster_id, cluster, current_time)
                 continue
             
-            # Initialize co-leader if not exists
-            if not hasattr(cluster, 'co_leader_id'):
-                cluster.co_leader_id = None
-                cluster.last_leader_check = current_time
-            
             # Check if leader is still valid
             leader_failed = False
             leader_failure_reason = ""
@@ -1738,10 +1777,6 @@ class CityVANETSimulator:
         if not cluster.head_id or cluster.head_id not in self.app.vehicle_nodes:
             return
         
-        # Initialize relay nodes list if not exists
-        if not hasattr(cluster, 'relay_nodes'):
-            cluster.relay_nodes = set()
-        
         leader_node = self.app.vehicle_nodes[cluster.head_id]
         leader_x, leader_y = leader_node.location
         
@@ -1782,6 +1817,7 @@ class CityVANETSimulator:
             return
         
         # For each out-of-range member, find best relay from in-range members
+        range_sq = self.communication_range * self.communication_range
         relay_count = 0
         for oor_member in out_of_range_members:
             best_relay = None
@@ -1789,10 +1825,10 @@ class CityVANETSimulator:
             
             for ir_member in in_range_members:
                 # Check if this in-range member can reach the out-of-range member
-                dist = math.sqrt((oor_member['x'] - ir_member['x'])**2 + 
-                               (oor_member['y'] - ir_member['y'])**2)
+                dx = oor_member['x'] - ir_member['x']
+                dy = oor_member['y'] - ir_member['y']
                 
-                if dist <= self.communication_range:
+                if dx * dx + dy * dy <= range_sq:
                     # Calculate relay quality score
                     node = ir_member['node']
                     
@@ -1810,9 +1846,10 @@ class CityVANETSimulator:
                     stability_score = max(0.0, 1.0 - (node.speed / 70.0))
                     
                     # Coverage - how many out-of-range members can this relay reach
+                    ir_x, ir_y = ir_member['x'], ir_member['y']
                     coverage_count = sum(1 for other_oor in out_of_range_members
-                                       if math.sqrt((other_oor['x'] - ir_member['x'])**2 + 
-                                                  (other_oor['y'] - ir_member['y'])**2) <= self.communication_range)
+                                       if (other_oor['x'] - ir_x) * (other_oor['x'] - ir_x) +
+                                          (other_oor['y'] - ir_y) * (other_oor['y'] - ir_y) <= range_sq)
                     coverage_score = min(1.0, coverage_count / max(1, len(out_of_range_members)))
                     
                     # Composite relay score
@@ -1838,9 +1875,6 @@ class CityVANETSimulator:
     def _forward_message_through_relays(self, cluster: Cluster, message: Dict, 
                                         sender_id: str, current_time: float) -> List[str]:
         """Forward message through relay nodes to reach all cluster members"""
-        if not hasattr(cluster, 'relay_nodes'):
-            cluster.relay_nodes = set()
-        
         # Track which members received the message
         recipients = set()
         
@@ -1850,6 +1884,8 @@ class CityVANETSimulator:
         
         sender_node = self.app.vehicle_nodes[sender_id]
         sender_x, sender_y = sender_node.location
+        # Range checks compare squared distances, so no square root is taken
+        range_sq = self.communication_range * self.communication_range
         
         # Direct recipients (in range of sender)
         for member_id in cluster.member_ids:
@@ -1859,8 +1895,9 @@ class CityVANETSimulator:
             member_node = self.app.vehicle_nodes[member_id]
             member_x, member_y = member_node.location
             
-            dist = math.sqrt((sender_x - member_x)**2 + (sender_y - member_y)**2)
-            if dist <= self.communication_range:
+            dx = sender_x - member_x
+            dy = sender_y - member_y
+            if dx * dx + dy * dy <= range_sq:
                 recipients.add(member_id)
         
         # Relay forwarding for out-of-range members
@@ -1873,8 +1910,9 @@ class CityVANETSimulator:
             relay_x, relay_y = relay_node.location
             
             # Check if relay can receive from sender
-            dist_to_sender = math.sqrt((sender_x - relay_x)**2 + (sender_y - relay_y)**2)
-            if dist_to_sender > self.communication_range:
+            dx = sender_x - relay_x
+            dy = sender_y - relay_y
+            if dx * dx + dy * dy > range_sq:
                 continue
             
             # Relay forwards to members in its range
@@ -1885,8 +1923,9 @@ class CityVANETSimulator:
                 member_node = self.app.vehicle_nodes[member_id]
                 member_x, member_y = member_node.location
                 
-                dist = math.sqrt((relay_x - member_x)**2 + (relay_y - member_y)**2)
-                if dist <= self.communication_range:
+                dx = relay_x - member_x
+                dy = relay_y - member_y
+                if dx * dx + dy * dy <= range_sq:
                     relayed_members.add(member_id)
                     
                     # Track relay hop
@@ -1903,14 +1942,11 @@ class CityVANETSimulator:
             # Need at least 2 clusters for inter-cluster communication
             return
         
+        range_sq = self.communication_range * self.communication_range
         for cluster_id, cluster in all_clusters:
             if not cluster.member_ids or not cluster.head_id:
                 continue
             
-            # Initialize boundary nodes if not exists
-            if not hasattr(cluster, 'boundary_nodes'):
-                cluster.boundary_nodes = {}  # {neighbor_cluster_id: boundary_node_id}
-            
             # Find neighboring clusters (within extended range)
             INTER_CLUSTER_DETECTION_RANGE = 600  # 2x DSRC range for cluster proximity
             
@@ -1985,8 +2021,9 @@ class CityVANETSimulator:
                             continue
                         other_node = self.app.vehicle_nodes[other_member_id]
                         other_x, other_y = other_node.location
-                        dist = math.sqrt((node_x - other_x)**2 + (node_y - other_y)**2)
-                        if dist <= self.communication_range:
+                        dx = node_x - other_x
+                        dy = node_y - other_y
+                        if dx * dx + dy * dy <= range_sq:
                             own_cluster_connectivity += 1
                     
                     connectivity_score = min(1.0, own_cluster_connectivity / max(1, len(cluster.member_ids)))
@@ -2234,9 +2271,8 @@ class CityVANETSimulator:
                 if hasattr(node, 'speed') and node.speed > 75:
                     suspicion_score += 0.2
                 
-                if hasattr(node, 'message_count'):
-                    if node.message_count > 100 and node.trust_score < 0.5:
-                        suspicion_score += 0.2
+                if node.message_count > 100 and node.trust_score < 0.5:
+                    suspicion_score += 0.2
                 
                 if suspicion_score >= 0.5:
                     for auth_id in cluster_authorities:
@@ -2270,8 +2306,9 @@ class CityVANETSimulator:
                 auth_node = self.app.vehicle_nodes[auth_id]
                 auth_x, auth_y = auth_node.location
                 
-                distance = ((x - auth_x)**2 + (y - auth_y)**2)**0.5
-                if distance < 300:
+                dx = x - auth_x
+                dy = y - auth_y
+                if dx * dx + dy * dy < 90000.0:  # Within 300 m
                     nearby_authorities.append(auth_id)
             
             if len(nearby_authorities) == 0:
@@ -2286,9 +2323,8 @@ class CityVANETSimulator:
                 suspicion_score += 0.4
             if hasattr(node, 'speed') and node.speed > 75:
                 suspicion_score += 0.2
-            if hasattr(node, 'message_count'):
-                if node.message_count > 100 and node.trust_score < 0.5:
-                    suspicion_score += 0.2
+            if node.message_count > 100 and node.trust_score < 0.5:
+                suspicion_score += 0.2
             
             # If suspicious, collect votes from nearby authorities
             if suspicion_score >= 0.5:
@@ -2319,7 +2355,7 @@ class CityVANETSimulator:
                 node.trust_score = max(0.05, node.trust_score * 0.7)  # 30% trust penalty
                 
                 # Mark as detected if not already
-                if not hasattr(node, 'flagged_by_poa') or not node.flagged_by_poa:
+                if not node.flagged_by_poa:
                     node.flagged_by_poa = True
                     self.app.statistics['malicious_detected'] = \
                         self.app.statistics.get('malicious_detected', 0) + 1
@@ -2374,7 +2410,7 @@ class CityVANETSimulator:
         # Malicious node stats
         malicious_count = sum(1 for node in self.app.vehicle_nodes.values() if node.is_malicious)
         flagged_count = sum(1 for node in self.app.vehicle_nodes.values() 
-                           if hasattr(node, 'flagged_by_poa') and node.flagged_by_poa)
+                           if node.flagged_by_poa)
         print(f"\n🚨 Security:")
         print(f"   Known malicious: {malicious_count}")
         print(f"   Flagged by PoA: {flagged_count}")
@@ -2391,7 +2427,7 @@ class CityVANETSimulator:
         print(f"   Communication range: {self.communication_range} pixels")
         
         # Relay node stats
-        total_relay_nodes = sum(len(c.relay_nodes) if hasattr(c, 'relay_nodes') else 0 
+        total_relay_nodes = sum(len(c.relay_nodes) 
                                for c in self.app.clustering_engine.clusters.values())
         print(f"\n🔁 Multi-Hop Relay System:")
         print(f"   Total relay nodes: {total_relay_nodes}")
@@ -2402,10 +2438,10 @@ class CityVANETSimulator:
             print(f"   Average hops per relayed message: {avg_hops:.2f}")
         
         # Boundary node stats (inter-cluster communication)
-        total_boundary_nodes = sum(len(c.boundary_nodes) if hasattr(c, 'boundary_nodes') else 0 
+        total_boundary_nodes = sum(len(c.boundary_nodes) 
                                   for c in self.app.clustering_engine.clusters.values())
         clusters_with_boundary = sum(1 for c in self.app.clustering_engine.clusters.values()
-                                     if hasattr(c, 'boundary_nodes') and c.boundary_nodes)
+                                     if c.boundary_nodes)
         print(f"\n🔷 Inter-Cluster Boundary Nodes:")
         print(f"   Total boundary nodes: {total_boundary_nodes}")
         print(f"   Clusters with boundary nodes: {clusters_with_boundary}")
@@ -2422,6 +2458,15 @@ class CityVANETSimulator:
         clusters = []
         traffic_lights = []
         
+        # Role lookups per cluster (co-leader, relay set, boundary set), built once
+        # per frame instead of scanning boundaries per vehicle
+        cluster_roles = {
+            cluster_id: (cluster.co_leader_id,
+                         cluster.relay_nodes,
+                         set(cluster.boundary_nodes.values()))
+            for cluster_id, cluster in self.app.clustering_engine.clusters.items()
+        }
+        
         # Capture vehicles with role information
         for vehicle_id, node in self.app.vehicle_nodes.items():
             x, y = node.location
@@ -2433,28 +2478,26 @@ class CityVANETSimulator:
             is_boundary = False
             is_co_leader = False
             
-            if node.cluster_id:
-                cluster = self.app.clustering_engine.clusters.get(node.cluster_id)
-                if cluster:
-                    # Check if co-leader
-                    if hasattr(cluster, 'co_leader_id') and cluster.co_leader_id == vehicle_id:
-                        is_co_leader = True
-                        role = 'co_leader'
-                    
-                    # Check if relay node
-                    if hasattr(cluster, 'relay_nodes') and vehicle_id in cluster.relay_nodes:
-                        is_relay = True
-                        if role == 'member':
-                            role = 'relay'
-                    
-                    # Check if boundary node
-                    if hasattr(cluster, 'boundary_nodes'):
-                        for neighbor_id, boundary_id in cluster.boundary_nodes.items():
-                            if boundary_id == vehicle_id:
-                                is_boundary = True
-                                if role == 'member':
-                                    role = 'boundary'
-                                break
+            roles = cluster_roles.get(node.cluster_id) if node.cluster_id else None
+            if roles:
+                co_leader_id, relay_nodes, boundary_ids = roles
+                
+                # Check if co-leader
+                if co_leader_id == vehicle_id:
+                    is_co_leader = True
+                    role = 'co_leader'
+                
+                # Check if relay node
+                if vehicle_id in relay_nodes:
+                    is_relay = True
+                    if role == 'member':
+                        role = 'relay'
+                
+                # Check if boundary node
+                if vehicle_id in boundary_ids:
+                    is_boundary = True
+                    if role == 'member':
+                        role = 'boundary'
             
             if node.is_cluster_head:
                 role = 'leader'
@@ -2517,8 +2560,8 @@ class CityVANETSimulator:
                     radius = min(calculated_radius, MAX_CLUSTER_RANGE)
                     
                     # Get special node counts
-                    relay_count = len(cluster.relay_nodes) if hasattr(cluster, 'relay_nodes') else 0
-                    boundary_count = len(cluster.boundary_nodes) if hasattr(cluster, 'boundary_nodes') else 0
+                    relay_count = len(cluster.relay_nodes)
+                    boundary_count = len(cluster.boundary_nodes)
                     
                     clusters.append({
                         'id': cluster_id,
@@ -2527,7 +2570,7 @@ class CityVANETSimulator:
                         'radius': radius,
                         'size': len(cluster.member_ids),
                         'leader_id': cluster.head_id,
-                        'co_leader_id': cluster.co_leader_id if hasattr(cluster, 'co_leader_id') else None,
+                        'co_leader_id': cluster.co_leader_id,
                         'relay_count': relay_count,
                         'boundary_count': boundary_count
                     })
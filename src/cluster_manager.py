@@ -96,15 +96,26 @@ class ClusterManager:
         self.vehicle_neighbors: Dict[str, Set[str]] = {}
         self.vehicle_mobility_history: Dict[str, List[Tuple[float, float, float]]] = {}  # (time, x, y)
         self.cluster_head_election_times: Dict[str, float] = {}
+        
+        # Vehicle lookup shared by the passes of one update_cluster_management call
+        self._vehicle_index: Optional[Dict[str, Vehicle]] = None
     
-    def update_cluster_management(self, vehicles: List[Vehicle], current_time: float) -> Dict[str, any]:
-        """Main cluster management update function"""
-        self.logger.debug(f"Cluster manager updating with {len(vehicles)} vehicles at time {current_time}")
+    def update_cluster_management(self, vehicles: List[Vehicle], current_time: float,
+                                  recluster: bool = True) -> Dict[str, any]:
+        """Main cluster management update function
+
+        With ``recluster=False`` the engine's current clusters are managed as they
+        are; elections, state changes and cleanup still run, as they depend on time.
+        """
+        self.logger.debug("Cluster manager updating with %s vehicles at time %s", len(vehicles), current_time)
         
         # Update clustering
-        clusters = self.clustering_engine.update_vehicles(vehicles)
+        if recluster:
+            clusters = self.clustering_engine.update_vehicles(vehicles)
+        else:
+            clusters = self.clustering_engine.clusters
         
-        self.logger.debug(f"Clustering engine returned {len(clusters)} clusters")
+        self.logger.debug("Clustering engine returned %s clusters", len(clusters))
         
         # Update vehicle tracking
         self._update_vehicle_tracking(vehicles, current_time)
@@ -112,44 +123,49 @@ class ClusterManager:
         # Manage cluster states and lifecycle
         management_actions = {}
         
-        for cluster_id, cluster in clusters.items():
-            # Initialize cluster tracking if new
-            if cluster_id not in self.cluster_states:
-                self._initialize_cluster_tracking(cluster_id, current_time)
+        # The per-cluster passes below all look members up in one shared index
+        self._vehicle_index = {v.id: v for v in vehicles}
+        try:
+            for cluster_id, cluster in clusters.items():
+                # Initialize cluster tracking if new
+                if cluster_id not in self.cluster_states:
+                    self._initialize_cluster_tracking(cluster_id, current_time)
             
-            # Update cluster metrics
-            self._update_cluster_metrics(cluster_id, cluster, vehicles, current_time)
+                # Update cluster metrics
+                self._update_cluster_metrics(cluster_id, cluster, vehicles, current_time)
             
-            # Perform cluster head election if needed
-            if self._should_reelect_head(cluster_id, current_time):
-                new_head = self._elect_cluster_head(cluster, vehicles)
-                if new_head and new_head != cluster.head_id:
-                    management_actions[cluster_id] = {
-                        'action': 'head_change',
-                        'old_head': cluster.head_id,
-                        'new_head': new_head
-                    }
-                    self._change_cluster_head(cluster_id, new_head, current_time)
+                # Perform cluster head election if needed
+                if self._should_reelect_head(cluster_id, current_time):
+                    new_head = self._elect_cluster_head(cluster, vehicles)
+                    if new_head and new_head != cluster.head_id:
+                        management_actions[cluster_id] = {
+                            'action': 'head_change',
+                            'old_head': cluster.head_id,
+                            'new_head': new_head
+                        }
+                        self._change_cluster_head(cluster_id, new_head, current_time)
             
-            # Check for cluster merging opportunities
-            merge_candidates = self._find_merge_candidates(cluster_id, clusters, current_time)
-            if merge_candidates:
-                management_actions[cluster_id] = {
-                    'action': 'merge_candidates',
-                    'candidates': merge_candidates
-                }
-            
-            # Check for cluster splitting needs
-            if self._should_split_cluster(cluster_id, cluster, vehicles):
-                split_plan = self._plan_cluster_split(cluster_id, cluster, vehicles)
-                if split_plan:
+                # Check for cluster merging opportunities
+                merge_candidates = self._find_merge_candidates(cluster_id, clusters, current_time)
+                if merge_candidates:
                     management_actions[cluster_id] = {
-                        'action': 'split_plan',
-                        'plan': split_plan
+                        'action': 'merge_candidates',
+                        'candidates': merge_candidates
                     }
             
-            # Update cluster state
-            self._update_cluster_state(cluster_id, current_time)
+                # Check for cluster splitting needs
+                if self._should_split_cluster(cluster_id, cluster, vehicles):
+                    split_plan = self._plan_cluster_split(cluster_id, cluster, vehicles)
+                    if split_plan:
+                        management_actions[cluster_id] = {
+                            'action': 'split_plan',
+                            'plan': split_plan
+                        }
+            
+                # Update cluster state
+                self._update_cluster_state(cluster_id, current_time)
+        finally:
+            self._vehicle_index = None
         
         # Clean up dissolved clusters
         self._cleanup_dissolved_clusters(clusters, current_time)
@@ -174,12 +190,10 @@ class ClusterManager:
             cluster_id=cluster_id
         )
         self.cluster_events.append(event)
-        self.logger.info(f"Initialized tracking for cluster {cluster_id}")
+        self.logger.info("Initialized tracking for cluster %s", cluster_id)
     
     def _update_vehicle_tracking(self, vehicles: List[Vehicle], current_time: float):
         """Update vehicle position history and neighbor relationships"""
-        vehicle_dict = {v.id: v for v in vehicles}
-        
         # Update position history
         for vehicle in vehicles:
             if vehicle.id not in self.vehicle_mobility_history:
@@ -194,20 +208,44 @@ class ClusterManager:
                 (t, x, y) for t, x, y in history if t >= cutoff_time
             ]
         
-        # Update neighbor relationships
+        # Update neighbor relationships. Each pair is checked once, sweeping along
+        # x so only vehicles within range on that axis are compared at all
         communication_range = 300.0  # meters
-        for i, vehicle1 in enumerate(vehicles):
-            neighbors = set()
-            for j, vehicle2 in enumerate(vehicles):
-                if i != j and vehicle1.distance_to(vehicle2) <= communication_range:
-                    neighbors.add(vehicle2.id)
-            self.vehicle_neighbors[vehicle1.id] = neighbors
+        range_sq = communication_range * communication_range
+        neighbor_sets = [set() for _ in vehicles]
+        order = sorted(range(len(vehicles)), key=lambda i: vehicles[i].x)
+        count = len(order)
+        for pos, i in enumerate(order):
+            vehicle1 = vehicles[i]
+            x1, y1 = vehicle1.x, vehicle1.y
+            neighbors1 = neighbor_sets[i]
+            k = pos + 1
+            while k < count:
+                j = order[k]
+                vehicle2 = vehicles[j]
+                dx = vehicle2.x - x1
+                if dx > communication_range:
+                    break
+                dy = vehicle2.y - y1
+                if dx * dx + dy * dy <= range_sq:
+                    neighbors1.add(vehicle2.id)
+                    neighbor_sets[j].add(vehicle1.id)
+                k += 1
+        
+        for vehicle, neighbors in zip(vehicles, neighbor_sets):
+            self.vehicle_neighbors[vehicle.id] = neighbors
+    
+    def _vehicles_by_id(self, all_vehicles: List[Vehicle]) -> Dict[str, Vehicle]:
+        """Get vehicles by ID, reusing the current update's index if any"""
+        if self._vehicle_index is not None:
+            return self._vehicle_index
+        return {v.id: v for v in all_vehicles}
     
     def _update_cluster_metrics(self, cluster_id: str, cluster: Cluster, 
                                all_vehicles: List[Vehicle], current_time: float):
         """Update metrics for a cluster"""
         metrics = self.cluster_metrics[cluster_id]
-        vehicle_dict = {v.id: v for v in all_vehicles}
+        vehicle_dict = self._vehicles_by_id(all_vehicles)
         
         # Get cluster vehicles
         cluster_vehicles = []
@@ -236,10 +274,10 @@ class ClusterManager:
         formation_time = self.cluster_formation_times.get(cluster_id, current_time)
         metrics.lifetime = current_time - formation_time
         
-        self.logger.debug(f"Updated metrics for cluster {cluster_id}: "
-                         f"stability={metrics.stability_score:.2f}, "
-                         f"connectivity={metrics.connectivity_degree}, "
-                         f"mobility_var={metrics.mobility_variance:.2f}")
+        self.logger.debug("Updated metrics for cluster %s: stability=%.2f, "
+                          "connectivity=%s, mobility_var=%.2f",
+                          cluster_id, metrics.stability_score,
+                          metrics.connectivity_degree, metrics.mobility_variance)
     
     def _calculate_stability_score(self, cluster_id: str, vehicles: List[Vehicle]) -> float:
         """Calculate cluster stability based on member retention"""
@@ -321,7 +359,7 @@ class ClusterManager:
     
     def _elect_cluster_head(self, cluster: Cluster, all_vehicles: List[Vehicle]) -> Optional[str]:
         """Elect the best cluster head based on configured method"""
-        vehicle_dict = {v.id: v for v in all_vehicles}
+        vehicle_dict = self._vehicles_by_id(all_vehicles)
         
         # Get candidate vehicles
         candidates = []
@@ -375,16 +413,16 @@ class ClusterManager:
     def _elect_by_position(self, candidates: List[Vehicle], cluster: Cluster) -> str:
         """Elect head based on position closest to cluster centroid"""
         best_vehicle = None
-        min_distance = float('inf')
+        min_distance_sq = float('inf')
         
         for vehicle in candidates:
-            distance = math.sqrt(
-                (vehicle.x - cluster.centroid_x)**2 + 
-                (vehicle.y - cluster.centroid_y)**2
-            )
+            # Squared distance orders candidates the same way, without the sqrt
+            dx = vehicle.x - cluster.centroid_x
+            dy = vehicle.y - cluster.centroid_y
+            distance_sq = dx * dx + dy * dy
             
-            if distance < min_distance:
-                min_distance = distance
+            if distance_sq < min_distance_sq:
+                min_distance_sq = distance_sq
                 best_vehicle = vehicle
         
         return best_vehicle.id if best_vehicle else candidates[0].id
@@ -473,25 +511,26 @@ class ClusterManager:
         )
         self.cluster_events.append(event)
         
-        self.logger.info(f"Changed head of cluster {cluster_id} from {old_head} to {new_head_id}")
+        self.logger.info("Changed head of cluster %s from %s to %s", cluster_id, old_head, new_head_id)
     
     def _find_merge_candidates(self, cluster_id: str, all_clusters: Dict[str, Cluster], 
                               current_time: float) -> List[str]:
         """Find clusters that could be merged with the given cluster"""
         target_cluster = all_clusters[cluster_id]
         candidates = []
+        max_merge_distance = self.clustering_engine.max_cluster_radius * 1.5
+        max_merge_distance_sq = max_merge_distance * max_merge_distance
         
         for other_id, other_cluster in all_clusters.items():
             if other_id == cluster_id:
                 continue
             
-            # Check if clusters are close enough
-            distance = math.sqrt(
-                (target_cluster.centroid_x - other_cluster.centroid_x)**2 + 
-                (target_cluster.centroid_y - other_cluster.centroid_y)**2
-            )
-            
-            if distance > self.clustering_engine.max_cluster_radius * 1.5:
+            # Check if clusters are close enough (squared, no sqrt needed)
+            dx = target_cluster.centroid_x - other_cluster.centroid_x
+            dy = target_cluster.centroid_y - other_cluster.centroid_y
+            if abs(dx) > max_merge_distance or abs(dy) > max_merge_distance:
+                continue
+            if dx * dx + dy * dy > max_merge_distance_sq:
                 continue
             
             # Check if merge would improve overall quality
@@ -548,7 +587,7 @@ class ClusterManager:
             return True
         
         # Check for spatial fragmentation
-        vehicle_dict = {v.id: v for v in all_vehicles}
+        vehicle_dict = self._vehicles_by_id(all_vehicles)
         cluster_vehicles = []
         if cluster.head_id in vehicle_dict:
             cluster_vehicles.append(vehicle_dict[cluster.head_id])
@@ -590,7 +629,7 @@ class ClusterManager:
     def _plan_cluster_split(self, cluster_id: str, cluster: Cluster, 
                            all_vehicles: List[Vehicle]) -> Optional[Dict]:
         """Plan how to split a cluster into smaller clusters"""
-        vehicle_dict = {v.id: v for v in all_vehicles}
+        vehicle_dict = self._vehicles_by_id(all_vehicles)
         cluster_vehicles = []
         
         if cluster.head_id in vehicle_dict:
@@ -620,8 +659,9 @@ class ClusterManager:
         group2 = []
         
         for vehicle in cluster_vehicles:
-            dist1 = math.sqrt((vehicle.x - centroid1[0])**2 + (vehicle.y - centroid1[1])**2)
-            dist2 = math.sqrt((vehicle.x - centroid2[0])**2 + (vehicle.y - centroid2[1])**2)
+            # Only the comparison matters, so squared distances will do
+            dist1 = (vehicle.x - centroid1[0])**2 + (vehicle.y - centroid1[1])**2
+            dist2 = (vehicle.x - centroid2[0])**2 + (vehicle.y - centroid2[1])**2
             
             if dist1 < dist2:
                 group1.append(vehicle.id)
@@ -691,7 +731,7 @@ class ClusterManager:
             if hasattr(self, '_previous_cluster_members'):
                 self._previous_cluster_members.pop(cluster_id, None)
             
-            self.logger.info(f"Cleaned up dissolved cluster {cluster_id}")
+            self.logger.info("Cleaned up dissolved cluster %s", cluster_id)
     
     def get_cluster_management_statistics(self) -> Dict:
         """Get comprehensive cluster management statistics"""
@@ -9,18 +9,20 @@ direction, speed, and proximity.
 import math
 import statistics
 from typing import List, Dict, Tuple, Optional, Set, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import logging
 import random
 
+from .vehicle_store import VehicleStore
+
 class ClusteringAlgorithm(Enum):
     KMEANS = "kmeans"
     DBSCAN = "dbscan"
     MOBILITY_BASED = "mobility_based"
     DIRECTION_BASED = "direction_based"
 
-@dataclass
+@dataclass(slots=True)
 class Vehicle:
     """Represents a vehicle in the VANET"""
     id: str
@@ -33,7 +35,7 @@ class Vehicle:
     
     def distance_to(self, other: 'Vehicle') -> float:
         """Calculate Euclidean distance to another vehicle"""
-        return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2)
+        return math.hypot(self.x - other.x, self.y - other.y)
     
     def speed_similarity(self, other: 'Vehicle') -> float:
         """Calculate speed similarity (0-1, where 1 is identical speed)"""
@@ -47,7 +49,7 @@ class Vehicle:
         angle_diff = min(angle_diff, 2*math.pi - angle_diff)  # Handle wraparound
         return max(0, 1 - (angle_diff / math.pi))
 
-@dataclass
+@dataclass(slots=True)
 class Cluster:
     """Represents a vehicle cluster"""
     id: str
@@ -59,6 +61,11 @@ class Cluster:
     avg_direction: float
     formation_time: float
     last_update: float
+    # Leader-redundancy and relay state maintained by the city scenario
+    co_leader_id: Optional[str] = None
+    last_leader_check: Optional[float] = None
+    relay_nodes: Set[str] = field(default_factory=set)
+    boundary_nodes: Dict[str, str] = field(default_factory=dict)  # {neighbor_cluster_id: boundary_node_id}
     
     def add_member(self, vehicle_id: str):
         """Add a vehicle to the cluster"""
@@ -136,7 +143,7 @@ class VehicleClustering:
             trustworthy_vehicles = [v for v in vehicles if self.is_vehicle_trustworthy_for_clustering(v.id)]
             filtered_count = len(vehicles) - len(trustworthy_vehicles)
             if filtered_count > 0:
-                self.logger.info(f"Trust filtering: excluded {filtered_count} untrustworthy vehicles from clustering")
+                self.logger.info("Trust filtering: excluded %d untrustworthy vehicles from clustering", filtered_count)
             vehicles = trustworthy_vehicles
         
         if self.algorithm == ClusteringAlgorithm.MOBILITY_BASED:
@@ -158,13 +165,14 @@ class VehicleClustering:
         current_time = vehicles[0].timestamp if vehicles else 0.0
         
         # Debug logging
-        self.logger.debug(f"Starting mobility-based clustering with {len(vehicles)} vehicles")
+        self.logger.debug("Starting mobility-based clustering with %d vehicles", len(vehicles))
         
         # Remove outdated clusters
         self._cleanup_clusters(current_time)
         
         # Create vehicle lookup
         vehicle_dict = {v.id: v for v in vehicles}
+        position_index = self._build_position_index(vehicles)
         
         # Process each vehicle
         for vehicle in vehicles:
@@ -186,14 +194,15 @@ class VehicleClustering:
                 self._add_vehicle_to_cluster(vehicle, best_cluster_id, current_time)
             else:
                 # Create new cluster if we have nearby vehicles
-                nearby_vehicles = self._find_nearby_vehicles(vehicle, vehicles)
-                self.logger.debug(f"Vehicle {vehicle.id} found {len(nearby_vehicles)} nearby vehicles")
+                nearby_vehicles = self._find_nearby_vehicles(vehicle, vehicles, position_index)
+                self.logger.debug("Vehicle %s found %d nearby vehicles", vehicle.id, len(nearby_vehicles))
                 
                 if len(nearby_vehicles) >= self.min_cluster_size - 1:
-                    self.logger.info(f"Creating new cluster for vehicle {vehicle.id} with {len(nearby_vehicles)} nearby vehicles")
+                    self.logger.info("Creating new cluster for vehicle %s with %d nearby vehicles",
+                                     vehicle.id, len(nearby_vehicles))
                     self._create_new_cluster(vehicle, nearby_vehicles, current_time)
         
-        self.logger.debug(f"Mobility clustering completed: {len(self.clusters)} clusters formed")
+        self.logger.debug("Mobility clustering completed: %d clusters formed", len(self.clusters))
         return self.clusters
     
     def _direction_based_clustering(self, vehicles: List[Vehicle]) -> Dict[str, Cluster]:
@@ -243,16 +252,32 @@ class VehicleClustering:
         
         return self.clusters
     
-    def _find_nearby_vehicles(self, target_vehicle: Vehicle, all_vehicles: List[Vehicle]) -> List[Vehicle]:
+    def _build_position_index(self, vehicles: List[Vehicle]) -> VehicleStore:
+        """Bucket vehicle positions into a grid with cells one clustering radius wide"""
+        position_index = VehicleStore(initial_capacity=max(1, len(vehicles)),
+                                      cell_size=self.max_cluster_radius)
+        for vehicle in vehicles:
+            position_index.add(vehicle.id, vehicle.x, vehicle.y)
+        return position_index
+    
+    def _find_nearby_vehicles(self, target_vehicle: Vehicle, all_vehicles: List[Vehicle],
+                              position_index: Optional[VehicleStore] = None) -> List[Vehicle]:
         """Find vehicles within clustering radius that are mobility-compatible"""
         nearby = []
         
-        for vehicle in all_vehicles:
+        if position_index is not None:
+            # Grid query returns only vehicles in range, in list order
+            slot_of = position_index.index
+            candidates = [all_vehicles[slot_of[vid]] for vid in position_index.neighbor_ids_within(
+                target_vehicle.x, target_vehicle.y, self.max_cluster_radius, exclude=target_vehicle.id)]
+        else:
+            candidates = all_vehicles
+        
+        for vehicle in candidates:
             if vehicle.id == target_vehicle.id:
                 continue
                 
-            distance = target_vehicle.distance_to(vehicle)
-            if distance > self.max_cluster_radius:
+            if position_index is None and target_vehicle.distance_to(vehicle) > self.max_cluster_radius:
                 continue
                 
             speed_diff = abs(target_vehicle.speed - vehicle.speed)
@@ -275,13 +300,12 @@ class VehicleClustering:
         if not cluster:
             return False
         
-        # Check if still within radius of cluster centroid
-        distance_to_centroid = math.sqrt(
-            (vehicle.x - cluster.centroid_x)**2 + 
-            (vehicle.y - cluster.centroid_y)**2
-        )
+        # Check if still within radius of cluster centroid (squared, no sqrt needed)
+        dx = vehicle.x - cluster.centroid_x
+        dy = vehicle.y - cluster.centroid_y
+        max_radius = self.max_cluster_radius * 1.2  # Allow some tolerance
         
-        if distance_to_centroid > self.max_cluster_radius * 1.2:  # Allow some tolerance
+        if dx * dx + dy * dy > max_radius * max_radius:
             return False
         
         # Check mobility compatibility with cluster
@@ -300,18 +324,17 @@ class VehicleClustering:
         """Find the best existing cluster for a vehicle to join"""
         best_cluster_id = None
         best_score = float('-inf')
+        max_radius_sq = self.max_cluster_radius * self.max_cluster_radius
         
         for cluster_id, cluster in self.clusters.items():
             if cluster.size() >= self.max_cluster_size:
                 continue
             
-            # Calculate distance to cluster centroid
-            distance = math.sqrt(
-                (vehicle.x - cluster.centroid_x)**2 + 
-                (vehicle.y - cluster.centroid_y)**2
-            )
+            # Compare squared distance to cluster centroid
+            dx = vehicle.x - cluster.centroid_x
+            dy = vehicle.y - cluster.centroid_y
             
-            if distance > self.max_cluster_radius:
+            if dx * dx + dy * dy > max_radius_sq:
                 continue
             
             # Calculate compatibility score
@@ -326,10 +349,7 @@ class VehicleClustering:
     def _calculate_cluster_compatibility(self, vehicle: Vehicle, cluster: Cluster) -> float:
         """Calculate how compatible a vehicle is with a cluster (0-1)"""
         # Distance factor (closer is better)
-        distance = math.sqrt(
-            (vehicle.x - cluster.centroid_x)**2 + 
-            (vehicle.y - cluster.centroid_y)**2
-        )
+        distance = math.hypot(vehicle.x - cluster.centroid_x, vehicle.y - cluster.centroid_y)
         distance_score = max(0, 1 - (distance / self.max_cluster_radius))
         
         # Speed similarity
@@ -387,7 +407,7 @@ class VehicleClustering:
         for vehicle in vehicles:
             self.vehicle_to_cluster[vehicle.id] = cluster_id
         
-        self.logger.info(f"Created cluster {cluster_id} with {len(vehicles)} vehicles")
+        self.logger.info("Created cluster %s with %d vehicles", cluster_id, len(vehicles))
     
     def _calculate_average_direction(self, directions: List[float]) -> float:
         """Calculate average direction handling circular nature of angles"""
@@ -406,7 +426,7 @@ class VehicleClustering:
         self.vehicle_to_cluster[vehicle.id] = cluster_id
         self._update_cluster_with_vehicle(vehicle, cluster_id, current_time)
         
-        self.logger.debug(f"Added vehicle {vehicle.id} to cluster {cluster_id}")
+        self.logger.debug("Added vehicle %s to cluster %s", vehicle.id, cluster_id)
     
     def _remove_vehicle_from_cluster(self, vehicle_id: str, cluster_id: str):
         """Remove a vehicle from its cluster"""
@@ -420,11 +440,11 @@ class VehicleClustering:
             if cluster.member_ids:
                 new_head = cluster.member_ids.pop()
                 cluster.head_id = new_head
-                self.logger.info(f"Promoted vehicle {new_head} to head of cluster {cluster_id}")
+                self.logger.info("Promoted vehicle %s to head of cluster %s", new_head, cluster_id)
             else:
                 # Dissolve cluster
                 del self.clusters[cluster_id]
-                self.logger.info(f"Dissolved cluster {cluster_id}")
+                self.logger.info("Dissolved cluster %s", cluster_id)
         else:
             cluster.remove_member(vehicle_id)
         
@@ -462,7 +482,7 @@ class VehicleClustering:
                 del self.vehicle_to_cluster[member_id]
         
         del self.clusters[cluster_id]
-        self.logger.info(f"Dissolved cluster {cluster_id}")
+        self.logger.info("Dissolved cluster %s", cluster_id)
     
     def _cleanup_clusters(self, current_time: float):
         """Remove old or invalid clusters"""
@@ -528,8 +548,11 @@ class VehicleClustering:
                 min_dist = float('inf')
                 closest_centroid = 0
                 
+                # Squared distances give the same nearest centroid
                 for c_idx, centroid in enumerate(centroids):
-                    dist = math.sqrt((pos[0] - centroid[0])**2 + (pos[1] - centroid[1])**2)
+                    dx = pos[0] - centroid[0]
+                    dy = pos[1] - centroid[1]
+                    dist = dx * dx + dy * dy
                     if dist < min_dist:
                         min_dist = dist
                         closest_centroid = c_idx
@@ -577,6 +600,14 @@ class VehicleClustering:
         
         positions = [[v.x, v.y] for v in vehicles]
         labels = [-1] * len(vehicles)  # -1 means noise
+        
+        # Region queries only look at the 3x3 grid cells around each point
+        position_index = self._build_position_index(vehicles)
+        slot_of = position_index.index
+        
+        def region_query(idx: int) -> List[int]:
+            x, y = positions[idx]
+            return [slot_of[vid] for vid in position_index.neighbor_ids_within(x, y, eps)]
         cluster_id = 0
         
         for i, vehicle in enumerate(vehicles):
@@ -584,12 +615,7 @@ class VehicleClustering:
                 continue
             
             # Find neighbors
-            neighbors = []
-            for j, other_pos in enumerate(positions):
-                dist = math.sqrt((positions[i][0] - other_pos[0])**2 + 
-                               (positions[i][1] - other_pos[1])**2)
-                if dist <= eps:
-                    neighbors.append(j)
+            neighbors = region_query(i)
             
             if len(neighbors) < min_pts:
                 continue  # Noise point
@@ -611,12 +637,7 @@ class VehicleClustering:
                 labels[point_idx] = cluster_id
                 
                 # Find neighbors of this point
-                point_neighbors = []
-                for k, other_pos in enumerate(positions):
-                    dist = math.sqrt((positions[point_idx][0] - other_pos[0])**2 + 
-                                   (positions[point_idx][1] - other_pos[1])**2)
-                    if dist <= eps:
-                        point_neighbors.append(k)
+                point_neighbors = region_query(point_idx)
                 
                 if len(point_neighbors) >= min_pts:
                     for neighbor_idx in point_neighbors:
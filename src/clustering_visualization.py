@@ -15,9 +15,13 @@ import colorsys
 
 try:
     import traci
+    from traci.exceptions import TraCIException, FatalTraCIError
     TRACI_AVAILABLE = True
+    # Errors a TraCI call can raise; per-vehicle loops catch only these
+    TRACI_ERRORS = (TraCIException, FatalTraCIError)
 except ImportError:
     TRACI_AVAILABLE = False
+    TRACI_ERRORS = ()
     logging.warning("TraCI not available - visualization will be limited")
     
     # Create mock traci module for compatibility
@@ -91,6 +95,8 @@ class ClusterVisualizer:
         
         # Visualization state
         self.cluster_colors: Dict[str, Tuple[int, int, int]] = {}
+        # Last color sent per vehicle, with the node it was sent for
+        self.applied_colors: Dict[str, Tuple[object, Tuple[int, int, int]]] = {}
         self.last_color_update = 0.0
         self.last_line_update = 0.0
         self.last_metrics_update = 0.0
@@ -140,7 +146,7 @@ class ClusterVisualizer:
             self.visualization_stats['last_update_time'] = time.time() - start_time
             
         except Exception as e:
-            self.logger.error(f"Error updating visualization: {e}")
+            self.logger.error("Error updating visualization: %s", e)
     
     def _should_update_colors(self, current_time: float) -> bool:
         """Check if vehicle colors should be updated"""
@@ -164,27 +170,39 @@ class ClusterVisualizer:
         # Generate colors for clusters if needed
         self._generate_cluster_colors(clusters)
         
+        # A reused ID maps to a new node, so departed vehicles need no per-update
+        # scan; stale entries are only dropped once they outnumber the live ones
+        vehicle_nodes = self.vanet_app.vehicle_nodes
+        applied_colors = self.applied_colors
+        if len(applied_colors) > 2 * len(vehicle_nodes) + 64:
+            for vehicle_id in applied_colors.keys() - vehicle_nodes.keys():
+                del applied_colors[vehicle_id]
+        
         # Update each vehicle's color
-        for vehicle_id, node in self.vanet_app.vehicle_nodes.items():
-            try:
-                if not node.cluster_id:
-                    # Unclustered vehicle
-                    color = self.config.unclustered_color
-                elif node.is_cluster_head and self.config.show_head_highlighting:
-                    # Cluster head
-                    color = self.config.cluster_head_color
-                elif node.cluster_id in self.cluster_colors and self.config.show_cluster_colors:
-                    # Cluster member
-                    color = self.cluster_colors[node.cluster_id]
-                else:
-                    # Default color
-                    color = self.config.default_vehicle_color
-                
-                # Apply color to vehicle in SUMO
-                traci.vehicle.setColor(vehicle_id, color)
-                
-            except Exception as e:
-                self.logger.debug(f"Could not set color for vehicle {vehicle_id}: {e}")
+        for vehicle_id, node in vehicle_nodes.items():
+            if not node.cluster_id:
+                # Unclustered vehicle
+                color = self.config.unclustered_color
+            elif node.is_cluster_head and self.config.show_head_highlighting:
+                # Cluster head
+                color = self.config.cluster_head_color
+            elif node.cluster_id in self.cluster_colors and self.config.show_cluster_colors:
+                # Cluster member
+                color = self.cluster_colors[node.cluster_id]
+            else:
+                # Default color
+                color = self.config.default_vehicle_color
+            
+            # Apply color to vehicle in SUMO; each call is a TraCI round
+            # trip, so vehicles whose color is unchanged are skipped
+            applied = applied_colors.get(vehicle_id)
+            if applied is None or applied[0] is not node or applied[1] != color:
+                try:
+                    traci.vehicle.setColor(vehicle_id, color)
+                except TRACI_ERRORS as e:
+                    self.logger.debug("Could not set color for vehicle %s: %s", vehicle_id, e)
+                    continue
+                applied_colors[vehicle_id] = (node, color)
     
     def _generate_cluster_colors(self, clusters: Dict[str, Cluster]):
         """Generate unique colors for each cluster"""
@@ -255,8 +273,8 @@ class ClusterVisualizer:
                     )
                     self.active_lines.add(line_id)
                     
-                except Exception as e:
-                    self.logger.debug(f"Could not create line {line_id}: {e}")
+                except TRACI_ERRORS as e:
+                    self.logger.debug("Could not create line %s: %s", line_id, e)
     
     def _update_cluster_boundaries(self):
         """Update cluster boundary visualization"""
@@ -354,7 +372,7 @@ class ClusterVisualizer:
             self.active_polygons.add(polygon_id)
             
         except Exception as e:
-            self.logger.debug(f"Could not create boundary polygon {polygon_id}: {e}")
+            self.logger.debug("Could not create boundary polygon %s: %s", polygon_id, e)
     
     def _update_performance_overlay(self):
         """Update performance metrics overlay"""
@@ -369,10 +387,10 @@ class ClusterVisualizer:
             
             # Display in SUMO GUI (if supported)
             # This is a placeholder - actual implementation would depend on SUMO GUI capabilities
-            self.logger.debug(f"Performance overlay: {overlay_text}")
+            self.logger.debug("Performance overlay: %s", overlay_text)
             
         except Exception as e:
-            self.logger.debug(f"Could not update performance overlay: {e}")
+            self.logger.debug("Could not update performance overlay: %s", e)
     
     def _format_performance_text(self, stats: Dict) -> str:
         """Format performance statistics for display"""
@@ -424,7 +442,7 @@ class ClusterVisualizer:
         elif mode == VisualizationMode.PERFORMANCE_METRICS:
             self.config.show_performance_overlay = enabled
         
-        self.logger.info(f"Visualization mode {mode.value} {'enabled' if enabled else 'disabled'}")
+        self.logger.info("Visualization mode %s %s", mode.value, 'enabled' if enabled else 'disabled')
     
     def highlight_cluster(self, cluster_id: str, duration: float = 5.0):
         """Temporarily highlight a specific cluster"""
@@ -443,7 +461,7 @@ class ClusterVisualizer:
         
         # Schedule color restoration (in a real implementation, this would be handled by a timer)
         # For now, we'll just log the action
-        self.logger.info(f"Highlighted cluster {cluster_id} for {duration} seconds")
+        self.logger.info("Highlighted cluster %s for %s seconds", cluster_id, duration)
     
     def create_cluster_animation(self, cluster_id: str, animation_type: str = "formation"):
         """Create animation for cluster events"""
@@ -472,19 +490,19 @@ class ClusterVisualizer:
                 circle_id = f"{animation_id}_radius_{radius}"
                 # This would create a circle in SUMO GUI
                 # Implementation depends on SUMO GUI capabilities
-                self.logger.debug(f"Animation frame: {circle_id}")
+                self.logger.debug("Animation frame: %s", circle_id)
                 
         except Exception as e:
-            self.logger.debug(f"Could not create formation animation: {e}")
+            self.logger.debug("Could not create formation animation: %s", e)
     
     def _animate_cluster_merge(self, cluster: Cluster):
         """Animate cluster merge process"""
-        self.logger.debug(f"Animating cluster merge for {cluster.id}")
+        self.logger.debug("Animating cluster merge for %s", cluster.id)
         # Implementation would show merging animation
     
     def _animate_cluster_split(self, cluster: Cluster):
         """Animate cluster split process"""
-        self.logger.debug(f"Animating cluster split for {cluster.id}")
+        self.logger.debug("Animating cluster split for %s", cluster.id)
         # Implementation would show splitting animation
     
     def export_visualization_data(self, filename: str):
@@ -517,9 +535,9 @@ class ClusterVisualizer:
             import json
             with open(filename, 'w') as f:
                 json.dump(visualization_data, f, indent=2)
-            self.logger.info(f"Visualization data exported to {filename}")
+            self.logger.info("Visualization data exported to %s", filename)
         except Exception as e:
-            self.logger.error(f"Could not export visualization data: {e}")
+            self.logger.error("Could not export visualization data: %s", e)
     
     def cleanup(self):
         """Clean up all visualization elements"""
@@ -533,6 +551,7 @@ class ClusterVisualizer:
                     traci.vehicle.setColor(vehicle_id, self.config.default_vehicle_color)
                 except:
                     pass
+        self.applied_colors.clear()
         
         self.logger.info("Visualization cleanup completed")
     
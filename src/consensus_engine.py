@@ -57,6 +57,27 @@ class ConsensusMessageType(Enum):
     REPUTATION_QUERY = "reputation_query"
     REPUTATION_RESPONSE = "reputation_response"
 
+# Message types routed to the Raft and PoA algorithms by ConsensusEngine
+RAFT_MESSAGE_TYPES = frozenset([
+    ConsensusMessageType.REQUEST_VOTE,
+    ConsensusMessageType.VOTE_RESPONSE,
+    ConsensusMessageType.APPEND_ENTRIES,
+    ConsensusMessageType.HEARTBEAT
+])
+POA_MESSAGE_TYPES = frozenset([
+    ConsensusMessageType.AUTHORITY_ANNOUNCEMENT,
+    ConsensusMessageType.TRUST_PROPOSAL,
+    ConsensusMessageType.TRUST_VOTE,
+    ConsensusMessageType.MALICIOUS_NODE_REPORT
+])
+
+# Weights of the individual metrics in the overall trust score
+TRUST_WEIGHT_AUTHENTICITY = 0.25
+TRUST_WEIGHT_CONSISTENCY = 0.20
+TRUST_WEIGHT_PARTICIPATION = 0.20
+TRUST_WEIGHT_RELIABILITY = 0.20
+TRUST_WEIGHT_LOCATION = 0.15
+
 @dataclass
 class TrustMetrics:
     """Trust evaluation metrics for a node"""
@@ -70,20 +91,12 @@ class TrustMetrics:
     
     def calculate_overall_trust(self) -> float:
         """Calculate overall trust score (0-1)"""
-        weights = {
-            'authenticity': 0.25,
-            'consistency': 0.20,
-            'participation': 0.20,
-            'reliability': 0.20,
-            'location': 0.15
-        }
-        
         return (
-            self.message_authenticity * weights['authenticity'] +
-            self.behavior_consistency * weights['consistency'] +
-            self.network_participation * weights['participation'] +
-            self.response_reliability * weights['reliability'] +
-            self.location_verification * weights['location']
+            self.message_authenticity * TRUST_WEIGHT_AUTHENTICITY +
+            self.behavior_consistency * TRUST_WEIGHT_CONSISTENCY +
+            self.network_participation * TRUST_WEIGHT_PARTICIPATION +
+            self.response_reliability * TRUST_WEIGHT_RELIABILITY +
+            self.location_verification * TRUST_WEIGHT_LOCATION
         )
 
 @dataclass
@@ -169,7 +182,7 @@ class RaftConsensus(ConsensusAlgorithm):
         # Voting
         self.votes_received: Set[str] = set()
         
-        logger.info(f"Raft node {node_id} initialized with {len(cluster_nodes)} cluster nodes")
+        logger.info("Raft node %s initialized with %s cluster nodes", node_id, len(cluster_nodes))
     
     def process_message(self, message: ConsensusMessage) -> Optional[ConsensusMessage]:
         """Process incoming Raft message"""
@@ -302,7 +315,7 @@ class RaftConsensus(ConsensusAlgorithm):
                     }
                 ))
         
-        logger.info(f"Node {self.node_id} started election for term {self.current_term}")
+        logger.info("Node %s started election for term %s", self.node_id, self.current_term)
         return vote_requests
     
     def _become_leader(self):
@@ -315,7 +328,7 @@ class RaftConsensus(ConsensusAlgorithm):
                 self.next_index[node_id] = len(self.log)
                 self.match_index[node_id] = 0
         
-        logger.info(f"Node {self.node_id} became leader for term {self.current_term}")
+        logger.info("Node %s became leader for term %s", self.node_id, self.current_term)
     
     def get_leader(self) -> Optional[str]:
         """Get current leader node ID"""
@@ -387,7 +400,7 @@ class PoAConsensus(ConsensusAlgorithm):
         self.trust_proposals: Dict[str, Dict] = {}
         self.trust_votes: Dict[str, Dict[str, bool]] = {}
         
-        logger.info(f"PoA node {node_id} initialized with {len(initial_authorities)} authorities")
+        logger.info("PoA node %s initialized with %s authorities", node_id, len(initial_authorities))
     
     def process_message(self, message: ConsensusMessage) -> Optional[ConsensusMessage]:
         """Process incoming PoA message"""
@@ -409,7 +422,7 @@ class PoAConsensus(ConsensusAlgorithm):
         
         if authority_id in self.authorities:
             self.authority_scores[authority_id] = authority_score
-            logger.debug(f"Updated authority score for {authority_id}: {authority_score}")
+            logger.debug("Updated authority score for %s: %s", authority_id, authority_score)
         
         return None
     
@@ -469,7 +482,8 @@ class PoAConsensus(ConsensusAlgorithm):
         
         # Process malicious activity report
         if target_node and activity_type:
-            logger.warning(f"Malicious activity reported: {target_node} - {activity_type} (severity: {severity})")
+            logger.warning("Malicious activity reported: %s - %s (severity: %s)",
+                           target_node, activity_type, severity)
             
             # If we're an authority, investigate the report
             if self.node_id in self.authorities:
@@ -494,7 +508,7 @@ class PoAConsensus(ConsensusAlgorithm):
         if best_authority != self.current_leader:
             self.current_leader = best_authority
             self.last_leader_change = time.time()
-            logger.info(f"New PoA leader selected: {best_authority}")
+            logger.info("New PoA leader selected: %s", best_authority)
         
         return self.current_leader
     
@@ -510,7 +524,7 @@ class PoAConsensus(ConsensusAlgorithm):
         """Add new authority node"""
         self.authorities.add(node_id)
         self.authority_scores[node_id] = initial_score
-        logger.info(f"Added authority node: {node_id}")
+        logger.info("Added authority node: %s", node_id)
     
     def remove_authority(self, node_id: str):
         """Remove authority node"""
@@ -520,7 +534,7 @@ class PoAConsensus(ConsensusAlgorithm):
         if self.current_leader == node_id:
             self.current_leader = None
         
-        logger.info(f"Removed authority node: {node_id}")
+        logger.info("Removed authority node: %s", node_id)
     
     def update_authority_score(self, node_id: str, score: float):
         """Update authority score for node"""
@@ -571,7 +585,7 @@ class PoAConsensus(ConsensusAlgorithm):
         
         # If investigation score is high, consider node malicious
         if investigation_score >= 0.7:
-            logger.warning(f"Node {target_node} confirmed as malicious (score: {investigation_score})")
+            logger.warning("Node %s confirmed as malicious (score: %s)", target_node, investigation_score)
             # Additional actions could be taken here (e.g., blacklisting)
 
 class TrustEvaluationEngine:
@@ -588,7 +602,7 @@ class TrustEvaluationEngine:
         self.trusted_threshold = 0.7
         self.report_confidence_threshold = 0.8
         
-        logger.info(f"Trust evaluation engine initialized for node {node_id}")
+        logger.info("Trust evaluation engine initialized for node %s", node_id)
     
     def evaluate_node_trust(self, node_id: str, metrics: TrustMetrics) -> float:
         """Evaluate trust score for a node"""
@@ -641,7 +655,7 @@ class TrustEvaluationEngine:
                 )
                 
                 self.malicious_reports.append(activity)
-                logger.warning(f"Malicious behavior detected: {node_id} - {activity.activity_type}")
+                logger.warning("Malicious behavior detected: %s - %s", node_id, activity.activity_type)
                 return activity
         
         return None
@@ -651,8 +665,11 @@ class TrustEvaluationEngine:
         if node_id not in self.trust_scores:
             return TrustLevel.UNKNOWN
         
-        trust_score = self.trust_scores[node_id].calculate_overall_trust()
-        
+        return self.trust_level_for_score(self.trust_scores[node_id].calculate_overall_trust())
+    
+    @staticmethod
+    def trust_level_for_score(trust_score: float) -> TrustLevel:
+        """Map an overall trust score to a trust level"""
         if trust_score >= 0.9:
             return TrustLevel.VERY_HIGH
         elif trust_score >= 0.7:
@@ -694,7 +711,7 @@ class TrustEvaluationEngine:
             speed_kmh = (distance / 1000) / (time_diff / 3600)  # km/h
             
             if speed_kmh > max_speed:
-                logger.warning(f"Impossible speed detected for {node_id}: {speed_kmh} km/h")
+                logger.warning("Impossible speed detected for %s: %s km/h", node_id, speed_kmh)
                 return True
         
         return False
@@ -770,27 +787,27 @@ class ConsensusEngine:
         self.is_running = False
         self.message_handlers: Dict[ConsensusMessageType, Callable] = {}
         
-        logger.info(f"Consensus engine initialized for node {node_id} with type {consensus_type}")
+        logger.info("Consensus engine initialized for node %s with type %s", node_id, consensus_type)
     
     def initialize_raft(self, cluster_nodes: List[str]):
         """Initialize Raft consensus"""
         self.raft = RaftConsensus(self.node_id, cluster_nodes)
-        logger.info(f"Raft consensus initialized with {len(cluster_nodes)} nodes")
+        logger.info("Raft consensus initialized with %s nodes", len(cluster_nodes))
     
     def initialize_poa(self, authorities: List[str]):
         """Initialize PoA consensus"""
         self.poa = PoAConsensus(self.node_id, authorities)
-        logger.info(f"PoA consensus initialized with {len(authorities)} authorities")
+        logger.info("PoA consensus initialized with %s authorities", len(authorities))
     
     def start(self):
         """Start consensus engine"""
         self.is_running = True
-        logger.info(f"Consensus engine started for node {self.node_id}")
+        logger.info("Consensus engine started for node %s", self.node_id)
     
     def stop(self):
         """Stop consensus engine"""
         self.is_running = False
-        logger.info(f"Consensus engine stopped for node {self.node_id}")
+        logger.info("Consensus engine stopped for node %s", self.node_id)
     
     def process_message(self, message: ConsensusMessage) -> Optional[ConsensusMessage]:
         """Process incoming consensus message"""
@@ -800,17 +817,12 @@ class ConsensusEngine:
         response = None
         
         # Route message to appropriate consensus algorithm
-        if message.msg_type in [ConsensusMessageType.REQUEST_VOTE, 
-                               ConsensusMessageType.VOTE_RESPONSE,
-                               ConsensusMessageType.APPEND_ENTRIES,
-                               ConsensusMessageType.HEARTBEAT]:
+        msg_type = message.msg_type
+        if msg_type in RAFT_MESSAGE_TYPES:
             if self.raft:
                 response = self.raft.process_message(message)
         
-        elif message.msg_type in [ConsensusMessageType.AUTHORITY_ANNOUNCEMENT,
-                                 ConsensusMessageType.TRUST_PROPOSAL,
-                                 ConsensusMessageType.TRUST_VOTE,
-                                 ConsensusMessageType.MALICIOUS_NODE_REPORT]:
+        elif msg_type in POA_MESSAGE_TYPES:
             if self.poa:
                 response = self.poa.process_message(message)
         
@@ -8,25 +8,41 @@ algorithms, message processing, and vehicle communication management.
 import time
 import logging
 import math
-from typing import Dict, List, Optional, Set, Any, Tuple
-from dataclasses import dataclass
-from enum import Enum
+import random
+import heapq
+from operator import itemgetter
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Set, FrozenSet, Any, Tuple, DefaultDict, Deque, Iterable
+from dataclasses import dataclass, field
+from enum import IntEnum
 
 # Import our clustering modules
 from .clustering import Vehicle, Cluster, VehicleClustering, ClusteringAlgorithm
 from .cluster_manager import ClusterManager, ClusterState, ClusterMetrics, ClusterHeadElectionMethod
 from .trust_aware_cluster_manager import TrustAwareClusterManager
 from .message_processor import (
-    MessageProcessor, VANETMessage, MessageType, 
-    JoinResponseCode, MergeResponseCode
+    MessageProcessor, VANETMessage, MessageType as VANETMessageType,
+    JoinResponseCode, MergeResponseCode, REQUIRED_MESSAGE_FIELDS
 )
 from .consensus_engine import (
     ConsensusEngine, TrustMetrics, TrustLevel, MaliciousActivity,
     ConsensusMessage, ConsensusMessageType
 )
+from .vehicle_store import VehicleStore
 
-class MessageType(Enum):
-    """Message types for backward compatibility with tests"""
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    # NumPy is optional - trust decay falls back to a Python loop
+    NUMPY_AVAILABLE = False
+
+class MessageType(IntEnum):
+    """Message types for backward compatibility with tests
+
+    Not the same as ``message_processor.MessageType`` (imported here as
+    ``VANETMessageType``), which is what queued messages carry.
+    """
     BEACON = 1
     CLUSTER_HEAD_ANNOUNCEMENT = 2
     JOIN_REQUEST = 3
@@ -34,7 +50,36 @@ class MessageType(Enum):
     RELAY_ANNOUNCEMENT = 5
     BOUNDARY_UPDATE = 6
 
-@dataclass
+# Clustering message types routed to cluster members (or nearby vehicles)
+_CLUSTERING_MSG_TYPES = frozenset({
+    VANETMessageType.CLUSTER_JOIN_REQUEST, VANETMessageType.CLUSTER_HEAD_ANNOUNCEMENT,
+    VANETMessageType.CLUSTER_HEARTBEAT, VANETMessageType.CLUSTER_HEAD_ELECTION
+})
+
+# Clustering message types processed on receipt
+_RECEIVED_CLUSTERING_TYPES = frozenset({
+    VANETMessageType.CLUSTER_JOIN_REQUEST, VANETMessageType.CLUSTER_HEAD_ANNOUNCEMENT
+})
+
+# Message types with per-receiver handling in _process_received_message
+_PROCESS_ON_RECEIVE_TYPES = _RECEIVED_CLUSTERING_TYPES | {VANETMessageType.BEACON}
+
+DEFAULT_MESSAGE_BUFFER_SIZE = 100
+
+# Seconds subtracted from the next periodic task time to absorb float rounding
+PERIODIC_TASK_SLACK = 1e-6
+
+# Malformed incoming messages: log the first few, then only every Nth one
+BAD_MESSAGE_LOG_LIMIT = 10
+BAD_MESSAGE_LOG_EVERY = 1000
+
+# Raw message of a (message_data, parsed message) delivery pair
+_delivery_payload = itemgetter(0)
+
+# Rebuild the cleanup heap once it holds this many entries per tracked vehicle
+UPDATE_HEAP_COMPACT_FACTOR = 4
+
+@dataclass(slots=True)
 class VehicleNode:
     """Represents a vehicle node in the network"""
     vehicle_id: str
@@ -48,8 +93,9 @@ class VehicleNode:
     
     # Communication properties
     transmission_range: float = 300.0
-    neighbors: Set[str] = None
-    message_buffer: List[VANETMessage] = None
+    neighbors: Set[str] = field(default_factory=set)
+    message_buffer: Deque[VANETMessage] = field(
+        default_factory=lambda: deque(maxlen=DEFAULT_MESSAGE_BUFFER_SIZE))  # Drops oldest when full
     
     # Clustering properties
     cluster_id: str = ""
@@ -72,6 +118,7 @@ class VehicleNode:
     processing_power: float = 2.0  # GHz (randomized per vehicle)
     historical_trust: List[float] = None  # Track trust over time for sleeper detection
     social_trust: float = 1.0  # Trust given by neighbors
+    social_trust_votes: Dict[str, float] = field(default_factory=dict)  # Opinions by observer
     
     # Metric 3: Network Stability (15% weight)
     cluster_stability_score: float = 0.0  # How long as cluster head (normalized)
@@ -91,18 +138,21 @@ class VehicleNode:
     is_sleeper_agent: bool = False  # Flagged as sleeper agent
     trust_peak_detected: bool = False  # Detected suspicious trust spike
     
+    # Scenario state maintained by the city simulator
+    lane_offset: float = 0.0  # Lateral position offset from road center
+    prev_speed: Optional[float] = None  # Speed at the previous step, for hard-brake detection
+    message_count: int = 0
+    erratic_behavior_count: int = 0
+    sleeper_activation_time: float = 0.0
+    sleeper_activated: bool = False
+    flagged_by_poa: bool = False
+    
     def __post_init__(self):
-        if self.neighbors is None:
-            self.neighbors = set()
-        if self.message_buffer is None:
-            self.message_buffer = []
-        if self.last_update == 0.0:
-            self.last_update = time.time()
+        # last_update is simulation time supplied by the application (see add_vehicle)
         if self.historical_trust is None:
             self.historical_trust = [self.trust_score]  # Initialize with current trust
         
         # Randomize resource metrics (Improvement 1)
-        import random
         self.bandwidth = random.uniform(50.0, 150.0)  # 50-150 Mbps
         self.processing_power = random.uniform(1.0, 4.0)  # 1-4 GHz
     
@@ -127,10 +177,46 @@ class CustomVANETApplication:
         self.cluster_update_interval = 5.0  # seconds
         self.last_beacon_time = 0.0
         self.last_cluster_update = 0.0
+        # No periodic task can be due before this time (see _schedule_periodic_tasks)
+        self._next_periodic_time = 0.0
+        
+        # Incremental clustering: vehicle state at the last clustering update
+        self._clustering_dirty = True
+        self._clustered_states: Dict[str, Tuple[float, float, float, float, float, bool]] = {}
         
         # Vehicle management
         self.vehicle_nodes: Dict[str, VehicleNode] = {}
-        self.message_queue: Dict[str, Dict] = {}
+        # Pending messages keyed by (source_id, sequence_number, send time); a tuple
+        # key hashes its parts instead of formatting a string per send. Messages
+        # sent in-process are queued as VANETMessage objects, not serialized dicts.
+        self.message_queue: Dict[Any, Any] = {}
+        self.vehicle_store = VehicleStore()  # SoA positions for proximity queries
+        
+        # Min-heap of (last_update, vehicle_id) for timeout cleanup (stale entries skipped lazily)
+        self._update_heap: List[Tuple[float, str]] = []
+        
+        # Trust/malicious views served to the clustering callbacks during an update
+        self._trust_snapshot: Optional[Dict[str, float]] = None
+        self._malicious_snapshot: Optional[FrozenSet[str]] = None
+        
+        # Vehicle objects built once per periodic pass and shared by beacons, the
+        # clustering update and its handlers (None outside a pass)
+        self._vehicle_snapshots: Optional[Dict[str, Vehicle]] = None
+        
+        # Per vehicle: (signature, send time) of the last beacon, for change-only beaconing
+        self._beacon_signatures: Dict[str, Tuple[Tuple, float]] = {}
+        
+        # Malformed messages rejected by receive_message (drives log throttling)
+        self._bad_message_count = 0
+        
+        # Inverted cluster index: cluster_id -> member vehicle IDs (and the reverse).
+        # Members are kept in dicts (insertion-ordered sets) so cluster broadcasts
+        # reach them in join order rather than in hash-seed dependent set order.
+        self._cluster_members: DefaultDict[str, Dict[str, None]] = defaultdict(dict)
+        self._member_cluster: Dict[str, str] = {}
+        
+        # Deliveries grouped by destination while the message queue is processed
+        self._pending_deliveries: Optional[DefaultDict[str, List[Dict[str, Any]]]] = None
         
         # Clustering components
         self.clustering_engine = VehicleClustering(clustering_algorithm)
@@ -153,6 +239,23 @@ class CustomVANETApplication:
         
         self.message_processor = MessageProcessor()
         
+        # Cluster management action handlers
+        self._action_handlers = {
+            'head_change': self._handle_head_change,
+            'merge_candidates': self._handle_merge_candidates,
+            'split_plan': self._handle_split_plan
+        }
+        
+        # Message processing result handlers, keyed by the result's action
+        self._result_handlers = {
+            'join_request_received': self._handle_join_request,
+            'join_response_received': self._handle_join_response,
+            'merge_request_received': self._handle_merge_request,
+            'merge_response_received': self._handle_merge_response,
+            'emergency_received': self._handle_emergency_message,
+            'update_neighbor': self._update_neighbor_info
+        }
+        
         # Consensus and Security components
         self.consensus_engine: Optional[ConsensusEngine] = None
         self.trust_enabled = True
@@ -189,10 +292,19 @@ class CustomVANETApplication:
         self.config = {
             'enable_clustering': True,
             'enable_emergency_handling': True,
-            'max_message_buffer_size': 100,
+            'max_message_buffer_size': DEFAULT_MESSAGE_BUFFER_SIZE,
             'neighbor_timeout': 10.0,
             'cluster_announcement_interval': 3.0,
-            'heartbeat_interval': 2.0
+            'heartbeat_interval': 2.0,
+            # Changes below these deltas don't trigger a clustering recompute
+            'cluster_position_threshold': 5.0,  # meters (|dx| + |dy|)
+            'cluster_speed_threshold': 1.0,  # m/s
+            'cluster_direction_threshold': 0.1,  # radians
+            'cluster_trust_threshold': 0.01,
+            # Skip beacons whose content hasn't changed, but still send one at least
+            # every keepalive interval (keep it below neighbor_timeout)
+            'suppress_unchanged_beacons': False,
+            'beacon_keepalive_interval': 5.0
         }
         
         self.logger = logging.getLogger(__name__)
@@ -203,6 +315,7 @@ class CustomVANETApplication:
         self.current_time = 0.0  # Use simulation time, not Unix time
         self.last_beacon_time = 0.0
         self.last_cluster_update = 0.0
+        self._next_periodic_time = 0.0
         self.is_initialized = True
         self.logger.info("VANET application initialized")
     
@@ -227,7 +340,8 @@ class CustomVANETApplication:
             self.consensus_engine.initialize_poa(authorities)
         
         self.consensus_engine.start()
-        self.logger.info(f"Consensus engine initialized: {consensus_type} with {len(self.authority_nodes)} authorities")
+        self.logger.info("Consensus engine initialized: %s with %s authorities",
+                         consensus_type, len(self.authority_nodes))
     
     def add_authority_node(self, node_id: str):
         """Add a node as a trusted authority"""
@@ -235,7 +349,7 @@ class CustomVANETApplication:
         if self.consensus_engine and self.consensus_engine.poa:
             self.consensus_engine.poa.authorities.add(node_id)
             self.consensus_engine.poa.authority_scores[node_id] = 0.8  # Initial high score
-        self.logger.info(f"Added authority node: {node_id}")
+        self.logger.info("Added authority node: %s", node_id)
     
     def remove_authority_node(self, node_id: str):
         """Remove authority status from a node"""
@@ -243,7 +357,7 @@ class CustomVANETApplication:
         if self.consensus_engine and self.consensus_engine.poa:
             self.consensus_engine.poa.authorities.discard(node_id)
             self.consensus_engine.poa.authority_scores.pop(node_id, None)
-        self.logger.info(f"Removed authority node: {node_id}")
+        self.logger.info("Removed authority node: %s", node_id)
     
     def handle_timeStep(self, simulation_time: float):
         """Handle simulation time step"""
@@ -259,22 +373,43 @@ class CustomVANETApplication:
         # Process message queue
         self._process_message_queue()
         
-        # Handle periodic operations
-        if self._should_send_beacons():
-            self._send_beacons()
-            self.last_beacon_time = self.current_time
+        # Handle periodic operations, skipping the checks until one can be due
+        if self.current_time >= self._next_periodic_time:
+            self._run_periodic_tasks()
         
-        if self._should_update_clusters():
-            self._update_clustering()
-            self.last_cluster_update = self.current_time
+        # Clean up old data
+        self._cleanup_old_data()
+    
+    def _run_periodic_tasks(self):
+        """Send beacons and update clusters and trust when their intervals elapse"""
+        # Vehicles don't move during the pass, so beacons and clustering share
+        # one set of Vehicle objects (built on first use, see _snapshot_vehicles)
+        self._vehicle_snapshots = {}
+        try:
+            if self._should_send_beacons():
+                self._send_beacons()
+                self.last_beacon_time = self.current_time
+            
+            if self._should_update_clusters():
+                self._update_clustering()
+                self.last_cluster_update = self.current_time
+        finally:
+            self._vehicle_snapshots = None
         
         # Update trust evaluations
         if self.trust_enabled and self._should_update_trust():
             self.update_trust_scores()
             self.apply_trust_decay()
         
-        # Clean up old data
-        self._cleanup_old_data()
+        self._schedule_periodic_tasks()
+    
+    def _schedule_periodic_tasks(self):
+        """Record the earliest time a beacon, clustering or trust update can be due"""
+        next_time = min(self.last_beacon_time + self.beacon_interval,
+                        self.last_cluster_update + self.cluster_update_interval,
+                        self.last_trust_update + self.trust_update_interval)
+        # Back off slightly so rounding never delays a task the predicates would run
+        self._next_periodic_time = next_time - PERIODIC_TASK_SLACK
     
     def add_vehicle(self, vehicle_id: str, x: float, y: float, speed: float, 
                    direction: float, lane_id: str = ""):
@@ -285,11 +420,15 @@ class CustomVANETApplication:
             speed=speed,
             direction=direction,
             lane_id=lane_id,
-            last_update=self.current_time
+            last_update=self.current_time,
+            message_buffer=deque(maxlen=self.config['max_message_buffer_size'])
         )
         
         self.vehicle_nodes[vehicle_id] = node
-        self.logger.debug(f"Added vehicle {vehicle_id} at ({x}, {y})")
+        self.vehicle_store.add(vehicle_id, x, y)
+        self._track_update(vehicle_id, node.last_update)
+        self._clustering_dirty = True
+        self.logger.debug("Added vehicle %s at (%s, %s)", vehicle_id, x, y)
         
         # Send immediate beacon to announce presence
         self._send_beacon(node)
@@ -304,10 +443,24 @@ class CustomVANETApplication:
             node.direction = direction
             node.lane_id = lane_id
             node.last_update = self.current_time
+            self.vehicle_store.update(vehicle_id, x, y)
+            self._track_update(vehicle_id, node.last_update)
         else:
             # Vehicle not tracked yet, add it
             self.add_vehicle(vehicle_id, x, y, speed, direction, lane_id)
     
+    def _track_update(self, vehicle_id: str, last_update: float):
+        """Push a vehicle update onto the cleanup heap"""
+        heap = self._update_heap
+        heapq.heappush(heap, (last_update, vehicle_id))
+        
+        # Superseded entries are only dropped once they expire, so vehicles updated
+        # every step pile them up; rebuild from the live timestamps when too many
+        if len(heap) > UPDATE_HEAP_COMPACT_FACTOR * (len(self.vehicle_nodes) + 16):
+            heap = [(node.last_update, vid) for vid, node in self.vehicle_nodes.items()]
+            heapq.heapify(heap)
+            self._update_heap = heap
+    
     def remove_vehicle(self, vehicle_id: str):
         """Remove vehicle from network"""
         if vehicle_id in self.vehicle_nodes:
@@ -322,7 +475,11 @@ class CustomVANETApplication:
                 self._send_cluster_leave_notification(node)
             
             del self.vehicle_nodes[vehicle_id]
-            self.logger.info(f"Removed vehicle {vehicle_id}")
+            self.vehicle_store.remove(vehicle_id)
+            self._beacon_signatures.pop(vehicle_id, None)
+            self._index_cluster_membership(vehicle_id, "")
+            self._clustering_dirty = True
+            self.logger.info("Removed vehicle %s", vehicle_id)
     
     def evaluate_node_trust(self, node_id: str, behavior_data: Dict[str, Any] = None) -> float:
         """Evaluate trust score for a node"""
@@ -351,7 +508,7 @@ class CustomVANETApplication:
         
         # Update node trust information
         node.trust_score = trust_score
-        node.trust_level = self.consensus_engine.get_trust_level(node_id)
+        node.trust_level = self.consensus_engine.trust_engine.trust_level_for_score(trust_score)
         node.last_trust_update = current_time
         
         # Check for malicious behavior if behavior data provided
@@ -382,7 +539,7 @@ class CustomVANETApplication:
         # Broadcast to authorities
         self._broadcast_consensus_message(report_message)
         
-        self.logger.warning(f"Malicious activity reported: {target_id} by {reporter_id}")
+        self.logger.warning("Malicious activity reported: %s by %s", target_id, reporter_id)
         return True
     
     def update_trust_scores(self):
@@ -391,10 +548,14 @@ class CustomVANETApplication:
             return
         
         current_time = self.current_time
+        trust_update_interval = self.trust_update_interval
+        decay_factor = 1 - self.trust_decay_rate
+        # Breakdowns are printed for the first 3 vehicles during the first 3 updates
+        shown_ids = set(list(self.vehicle_nodes)[:3]) if self.statistics['trust_updates'] < 3 else ()
         
         for node_id, node in self.vehicle_nodes.items():
             # Skip recent updates
-            if current_time - node.last_trust_update < self.trust_update_interval:
+            if current_time - node.last_trust_update < trust_update_interval:
                 continue
             
             # Collect behavior data
@@ -417,15 +578,14 @@ class CustomVANETApplication:
             node.trust_score = 0.5 * historical_avg + 0.5 * node.social_trust
             
             # Log trust updates for first 3 vehicles (to show transparency)
-            if self.statistics['trust_updates'] < 3 and node_id in list(self.vehicle_nodes.keys())[:3]:
+            if node_id in shown_ids:
                 print(f"   📊 Trust Update ({node_id}): "
                       f"Historical={historical_avg:.3f}, Social={node.social_trust:.3f} → "
                       f"New Trust={node.trust_score:.3f}")
             
             # Apply trust decay for inactive nodes
             if current_time - node.last_update > 3600:  # 1 hour
-                node.trust_score *= (1 - self.trust_decay_rate)
-                node.trust_score = max(0.0, node.trust_score)
+                node.trust_score = max(0.0, node.trust_score * decay_factor)
             
             node.last_trust_update = current_time
         
@@ -509,10 +669,6 @@ class CustomVANETApplication:
         observer = self.vehicle_nodes[observer_id]
         observed = self.vehicle_nodes[observed_id]
         
-        # Track interaction history (if not exists, create it)
-        if not hasattr(observed, 'social_trust_votes'):
-            observed.social_trust_votes = {}
-        
         # Record this observer's opinion
         observed.social_trust_votes[observer_id] = interaction_quality
         
@@ -632,7 +788,7 @@ class CustomVANETApplication:
         centroid_y /= valid_members
         
         # Calculate distance from node to centroid
-        distance = ((node.location[0] - centroid_x)**2 + (node.location[1] - centroid_y)**2)**0.5
+        distance = math.hypot(node.location[0] - centroid_x, node.location[1] - centroid_y)
         node.distance_from_cluster_center = distance
         
         # Normalize distance (assume max cluster radius = 500 meters)
@@ -646,30 +802,52 @@ class CustomVANETApplication:
     
     def is_node_trusted(self, node_id: str) -> bool:
         """Check if a node is trusted"""
-        if not self.trust_enabled or node_id not in self.vehicle_nodes:
+        node = self.vehicle_nodes.get(node_id) if self.trust_enabled else None
+        if node is None:
             return True  # Default to trusted if no trust system
         
-        node = self.vehicle_nodes[node_id]
         return node.trust_score >= self.trusted_threshold and not node.is_malicious
     
     def is_node_malicious(self, node_id: str) -> bool:
         """Check if a node is considered malicious"""
-        if not self.trust_enabled or node_id not in self.vehicle_nodes:
+        node = self.vehicle_nodes.get(node_id) if self.trust_enabled else None
+        if node is None:
             return False
         
-        node = self.vehicle_nodes[node_id]
         return node.is_malicious or node.trust_score <= self.malicious_threshold
     
     def _get_vehicle_trust_score(self, vehicle_id: str) -> float:
         """Internal callback for cluster manager to get trust scores"""
+        if self._trust_snapshot is not None:
+            return self._trust_snapshot.get(vehicle_id, 0.5)
         if vehicle_id not in self.vehicle_nodes:
             return 0.5  # Default neutral trust for unknown vehicles
         return self.vehicle_nodes[vehicle_id].trust_score
     
     def _is_vehicle_malicious(self, vehicle_id: str) -> bool:
         """Internal callback for cluster manager to check malicious status"""
+        if self._malicious_snapshot is not None:
+            return vehicle_id in self._malicious_snapshot
         return self.is_node_malicious(vehicle_id)
     
+    def _take_trust_snapshot(self):
+        """Capture trust scores and malicious flags once for a clustering update"""
+        if not self.trust_enabled:
+            self._trust_snapshot = {vid: node.trust_score for vid, node in self.vehicle_nodes.items()}
+            self._malicious_snapshot = frozenset()
+            return
+        
+        # One pass over the nodes fills both views
+        threshold = self.malicious_threshold
+        trust_scores = {}
+        malicious = []
+        for vid, node in self.vehicle_nodes.items():
+            trust_score = trust_scores[vid] = node.trust_score
+            if node.is_malicious or trust_score <= threshold:
+                malicious.append(vid)
+        self._trust_snapshot = trust_scores
+        self._malicious_snapshot = frozenset(malicious)
+    
     def update_trust_on_message_delivery(self, sender_id: str, success: bool, receiver_id: str = None):
         """
         Update trust score based on message delivery success
@@ -700,7 +878,7 @@ class CustomVANETApplication:
                 interaction_quality = 0.3  # Bad interaction (failed delivery)
                 self.update_social_trust_on_interaction(receiver_id, sender_id, interaction_quality)
         
-        self.logger.debug(f"Trust updated for {sender_id} after message delivery: {node.trust_score:.3f}")
+        self.logger.debug("Trust updated for %s after message delivery: %.3f", sender_id, node.trust_score)
     
     def update_trust_on_cooperation(self, vehicle_id: str, cooperation_score: float, observer_id: str = None):
         """
@@ -722,7 +900,7 @@ class CustomVANETApplication:
             # Cooperation score directly becomes interaction quality
             self.update_social_trust_on_interaction(observer_id, vehicle_id, cooperation_score)
         
-        self.logger.debug(f"Trust updated for {vehicle_id} based on cooperation: {node.trust_score:.3f}")
+        self.logger.debug("Trust updated for %s based on cooperation: %.3f", vehicle_id, node.trust_score)
     
     def update_trust_on_cluster_behavior(self, vehicle_id: str, is_head: bool, stability_contribution: float):
         """Update trust based on cluster behavior"""
@@ -730,20 +908,35 @@ class CustomVANETApplication:
             return
         
         node = self.vehicle_nodes[vehicle_id]
+        self._apply_cluster_behavior_delta((node,), self._cluster_behavior_delta(stability_contribution, is_head))
         
+        self.logger.debug("Trust updated for %s based on cluster behavior: %.3f", vehicle_id, node.trust_score)
+    
+    @staticmethod
+    def _cluster_behavior_delta(stability_contribution: float, is_head: bool) -> float:
+        """Get the trust adjustment for a given cluster stability (0.0 if neutral)"""
         # Reward stable cluster participation
         if stability_contribution > 0.7:
-            bonus = 0.003 if is_head else 0.001
-            node.trust_score = min(1.0, node.trust_score + bonus)
-            node.behavior_consistency_score = min(1.0, node.behavior_consistency_score + bonus)
+            return 0.003 if is_head else 0.001
         
         # Penalize unstable behavior
-        elif stability_contribution < 0.3:
-            penalty = 0.002 if is_head else 0.001
-            node.trust_score = max(0.0, node.trust_score - penalty)
-            node.behavior_consistency_score = max(0.0, node.behavior_consistency_score - penalty)
-        
-        self.logger.debug(f"Trust updated for {vehicle_id} based on cluster behavior: {node.trust_score:.3f}")
+        if stability_contribution < 0.3:
+            return -0.002 if is_head else -0.001
+        
+        return 0.0
+    
+    @staticmethod
+    def _apply_cluster_behavior_delta(nodes: Iterable[VehicleNode], delta: float):
+        """Shift trust and behavior consistency of ``nodes`` by ``delta``, clamped to [0, 1]"""
+        # The sign is the same for the whole batch, so pick the clamp once
+        if delta > 0:
+            for node in nodes:
+                node.trust_score = min(1.0, node.trust_score + delta)
+                node.behavior_consistency_score = min(1.0, node.behavior_consistency_score + delta)
+        elif delta < 0:
+            for node in nodes:
+                node.trust_score = max(0.0, node.trust_score + delta)
+                node.behavior_consistency_score = max(0.0, node.behavior_consistency_score + delta)
     
     def penalize_malicious_behavior(self, vehicle_id: str, severity: float):
         """Apply trust penalty for detected malicious behavior"""
@@ -763,7 +956,7 @@ class CustomVANETApplication:
             node.is_malicious = True
             node.malicious_activity_count += 1
         
-        self.logger.warning(f"Trust penalized for {vehicle_id} (malicious behavior): {node.trust_score:.3f}")
+        self.logger.warning("Trust penalized for %s (malicious behavior): %.3f", vehicle_id, node.trust_score)
     
     def apply_trust_decay(self):
         """Apply time-based trust decay for all vehicles"""
@@ -771,33 +964,73 @@ class CustomVANETApplication:
             return
         
         current_time = self.current_time
-        decay_applied = 0
+        inactive_threshold = 300  # Decay nodes inactive for more than 5 minutes
         
-        for vehicle_id, node in self.vehicle_nodes.items():
-            # Calculate time since last update
-            inactive_time = current_time - node.last_update
-            
-            # Apply decay for inactive nodes (more than 5 minutes)
-            if inactive_time > 300:
-                hours_inactive = inactive_time / 3600.0
-                decay_factor = (1 - self.trust_decay_rate) ** hours_inactive
-                
-                node.trust_score *= decay_factor
-                node.message_authenticity_score *= decay_factor
-                node.behavior_consistency_score *= decay_factor
-                
-                decay_applied += 1
+        # Every node has a cleanup-heap entry no newer than its last_update, so the
+        # heap minimum bounds the oldest node; usually nothing is old enough to decay
+        heap = self._update_heap
+        if not heap or (current_time - heap[0][0]) <= inactive_threshold:
+            return
+        
+        nodes = list(self.vehicle_nodes.values())
+        base = 1 - self.trust_decay_rate
+        
+        if NUMPY_AVAILABLE:
+            last_updates = np.fromiter((node.last_update for node in nodes), dtype=np.float64, count=len(nodes))
+            inactive_time = current_time - last_updates
+            inactive = np.flatnonzero(inactive_time > inactive_threshold)
+            factors = np.power(base, inactive_time[inactive] / 3600.0)
+            decayed = zip(inactive.tolist(), factors.tolist())
+        else:
+            decayed = []
+            for i, node in enumerate(nodes):
+                inactive_time = current_time - node.last_update
+                if inactive_time > inactive_threshold:
+                    decayed.append((i, base ** (inactive_time / 3600.0)))
+        
+        decay_applied = 0
+        for i, decay_factor in decayed:
+            node = nodes[i]
+            node.trust_score *= decay_factor
+            node.message_authenticity_score *= decay_factor
+            node.behavior_consistency_score *= decay_factor
+            decay_applied += 1
         
         if decay_applied > 0:
-            self.logger.debug(f"Applied trust decay to {decay_applied} inactive vehicles")
+            self.logger.debug("Applied trust decay to %d inactive vehicles", decay_applied)
     
     def receive_message(self, message_data: Dict[str, Any]):
         """Receive and process incoming message (external interface)"""
+        # Cheap type and key checks first, so malformed input is rejected without raising
+        if not isinstance(message_data, dict):
+            self._handle_bad_message(message_data, "payload is not a dict")
+            return
+        if not REQUIRED_MESSAGE_FIELDS.issubset(message_data):
+            self._handle_bad_message(message_data, "missing required fields")
+            return
+        
         try:
             # Convert dictionary to VANETMessage
             message = VANETMessage.from_dict(message_data)
-            
-            self.logger.debug(f"Received {message.message_type} message from {message.source_id}")
+        except Exception as e:
+            self._handle_bad_message(message_data, e)
+            return
+        
+        self._receive_parsed_message(message)
+    
+    def _handle_bad_message(self, message_data: Any, error: Any):
+        """Log a rejected incoming message, throttled so floods of bad input stay cheap"""
+        self._bad_message_count += 1
+        count = self._bad_message_count
+        if count <= BAD_MESSAGE_LOG_LIMIT or count % BAD_MESSAGE_LOG_EVERY == 0:
+            source_id = message_data.get('source_id') if isinstance(message_data, dict) else None
+            self.logger.error("Error processing message from %s: %s (%d rejected so far)",
+                              source_id, error, count)
+    
+    def _receive_parsed_message(self, message: VANETMessage):
+        """Receive and process an already parsed incoming message"""
+        try:
+            self.logger.debug("Received %s message from %s", message.message_type, message.source_id)
             
             # Process message
             result = self.message_processor.process_message(message, self.current_time)
@@ -805,11 +1038,11 @@ class CustomVANETApplication:
             # Handle processing result
             self._handle_message_processing_result(message, result)
             
-            # Note: messages_received counter is now incremented in _deliver_message_to_vehicle()
+            # Note: messages_received counter is now incremented in _deliver_messages_to_vehicle()
             # to properly count deliveries to each vehicle
             
         except Exception as e:
-            self.logger.error(f"Error processing message: {e}")
+            self.logger.error("Error processing message: %s", e)
     
     def send_data(self, source_id: str, data: str, data_type: str = "general",
                  priority: int = 0, is_emergency: bool = False) -> bool:
@@ -856,10 +1089,11 @@ class CustomVANETApplication:
         """Update vehicle states (placeholder for SUMO/TraCI integration)"""
         # This would integrate with SUMO via TraCI to get real vehicle positions
         # For now, we'll just update timestamps
-        for node in self.vehicle_nodes.values():
-            if self.current_time - node.last_update > self.config['neighbor_timeout']:
-                # Vehicle hasn't been updated recently, consider for removal
-                pass
+        self.vehicle_store.sync(self.vehicle_nodes)
+        self._sync_cluster_members()
+        
+        # Vehicles that haven't been updated recently are removed by
+        # _cleanup_old_data through the update heap, not by a scan here
     
     def _should_send_beacons(self) -> bool:
         """Check if it's time to send beacons"""
@@ -868,17 +1102,53 @@ class CustomVANETApplication:
     def _should_update_clusters(self) -> bool:
         """Check if it's time to update clusters"""
         should_update = (self.current_time - self.last_cluster_update) >= self.cluster_update_interval
-        self.logger.debug(f"Should update clusters? current_time={self.current_time}, last_update={self.last_cluster_update}, interval={self.cluster_update_interval}, result={should_update}")
+        self.logger.debug("Should update clusters? current_time=%s, last_update=%s, interval=%s, result=%s",
+                          self.current_time, self.last_cluster_update, self.cluster_update_interval, should_update)
         return should_update
     
+    def _clustering_state_changed(self) -> bool:
+        """Check if any vehicle changed materially since the last clustering update"""
+        if self._clustering_dirty or len(self._clustered_states) != len(self.vehicle_nodes):
+            return True
+        
+        position_threshold = self.config['cluster_position_threshold']
+        speed_threshold = self.config['cluster_speed_threshold']
+        direction_threshold = self.config['cluster_direction_threshold']
+        trust_threshold = self.config['cluster_trust_threshold']
+        
+        for vehicle_id, node in self.vehicle_nodes.items():
+            previous = self._clustered_states.get(vehicle_id)
+            if previous is None:
+                return True
+            
+            x, y, speed, direction, trust_score, is_malicious = previous
+            if (abs(node.location[0] - x) + abs(node.location[1] - y) > position_threshold or
+                    abs(node.speed - speed) > speed_threshold or
+                    abs(node.direction - direction) > direction_threshold or
+                    abs(node.trust_score - trust_score) > trust_threshold or
+                    node.is_malicious != is_malicious):
+                return True
+        
+        return False
+    
     def _should_update_trust(self) -> bool:
         """Check if it's time to update trust scores"""
         return (self.current_time - self.last_trust_update) >= self.trust_update_interval
     
     def _send_beacons(self):
         """Send beacon messages from all vehicles"""
-        for node in self.vehicle_nodes.values():
-            self._send_beacon(node)
+        nodes = list(self.vehicle_nodes.values())
+        clusters = self.clustering_engine.clusters
+        
+        vehicles = self._snapshot_vehicles()
+        if self.config['suppress_unchanged_beacons']:
+            nodes, vehicles = self._filter_unchanged_beacons(nodes, vehicles)
+            if not nodes:
+                return
+        node_clusters = [clusters.get(node.cluster_id) if node.cluster_id else None for node in nodes]
+        
+        messages = self.message_processor.create_beacon_messages(vehicles, node_clusters, self.current_time)
+        self._send_messages(messages)
     
     def _send_beacon(self, node: VehicleNode):
         """Send beacon message from a specific vehicle"""
@@ -896,28 +1166,49 @@ class CustomVANETApplication:
     def _update_clustering(self):
         """Update clustering for all vehicles"""
         self.logger.info("=== CLUSTERING UPDATE STARTED ===")
+        
+        # Cluster formation is only recomputed after a material change, but the
+        # time-driven management (re-election, state progression) runs every interval
+        recluster = self._clustering_state_changed()
+        if recluster:
+            # Remember the state this recompute is based on
+            self._clustered_states = {
+                vehicle_id: (node.location[0], node.location[1], node.speed, node.direction,
+                             node.trust_score, node.is_malicious)
+                for vehicle_id, node in self.vehicle_nodes.items()
+            }
+            self._clustering_dirty = False
+        else:
+            self.logger.debug("Vehicle states unchanged, keeping current cluster formation")
+        
         if not self.config['enable_clustering']:
             self.logger.debug("Clustering disabled, skipping update")
             return
         
         # Convert vehicle nodes to Vehicle objects
-        vehicles = [node.to_vehicle() for node in self.vehicle_nodes.values()]
+        vehicles = self._snapshot_vehicles()
         
         if not vehicles:
             self.logger.debug("No vehicles available for clustering")
             return
         
-        self.logger.debug(f"Starting clustering update with {len(vehicles)} vehicles")
+        self.logger.debug("Starting clustering update with %d vehicles", len(vehicles))
         
-        # Update clustering
-        management_result = self.cluster_manager.update_cluster_management(
-            vehicles, self.current_time
-        )
+        # Update clustering; trust doesn't change inside it, so callbacks read a snapshot
+        self._take_trust_snapshot()
+        try:
+            management_result = self.cluster_manager.update_cluster_management(
+                vehicles, self.current_time, recluster=recluster
+            )
+        finally:
+            self._trust_snapshot = None
+            self._malicious_snapshot = None
         
         clusters = management_result['clusters']
         management_actions = management_result['management_actions']
         
-        self.logger.debug(f"Clustering update completed: {len(clusters)} clusters, {len(management_actions)} actions")
+        self.logger.debug("Clustering update completed: %d clusters, %d actions",
+                          len(clusters), len(management_actions))
         
         # Update vehicle node cluster assignments
         self._update_vehicle_cluster_assignments(clusters)
@@ -932,108 +1223,164 @@ class CustomVANETApplication:
         # Send cluster announcements for new heads
         self._send_cluster_announcements(clusters)
         
-        self.logger.debug(f"Updated clustering: {len(clusters)} clusters active")
+        self.logger.debug("Updated clustering: %d clusters active", len(clusters))
+    
+    def _filter_unchanged_beacons(self, nodes: List[VehicleNode],
+                                  vehicles: List[Vehicle]) -> Tuple[List[VehicleNode], List[Vehicle]]:
+        """Drop beacons that would repeat the vehicle's last one, unless it is due a keepalive"""
+        sent = self._beacon_signatures
+        keepalive = self.config['beacon_keepalive_interval']
+        current_time = self.current_time
+        kept_nodes = []
+        kept_vehicles = []
+        
+        for node, vehicle in zip(nodes, vehicles):
+            x, y = node.location
+            signature = (round(x, 1), round(y, 1), round(node.speed, 1), round(node.direction, 2),
+                         node.cluster_id, node.is_cluster_head)
+            previous = sent.get(node.vehicle_id)
+            if previous is not None and previous[0] == signature and current_time - previous[1] < keepalive:
+                continue
+            sent[node.vehicle_id] = (signature, current_time)
+            kept_nodes.append(node)
+            kept_vehicles.append(vehicle)
+        
+        return kept_nodes, kept_vehicles
+    
+    def _snapshot_vehicles(self) -> List[Vehicle]:
+        """Get every node as a Vehicle, built once per periodic pass"""
+        snapshots = self._vehicle_snapshots
+        if snapshots is None:
+            return [node.to_vehicle() for node in self.vehicle_nodes.values()]
+        
+        if len(snapshots) != len(self.vehicle_nodes):
+            snapshots.clear()
+            snapshots.update((vehicle_id, node.to_vehicle()) for vehicle_id, node in self.vehicle_nodes.items())
+        return list(snapshots.values())
+    
+    def _vehicle_of(self, node: VehicleNode) -> Vehicle:
+        """Get a node as a Vehicle, reusing the periodic pass's snapshot if any"""
+        snapshots = self._vehicle_snapshots
+        if snapshots is not None:
+            vehicle = snapshots.get(node.vehicle_id)
+            if vehicle is not None:
+                return vehicle
+        return node.to_vehicle()
     
     def _update_vehicle_cluster_assignments(self, clusters: Dict[str, Cluster]):
         """Update vehicle nodes with cluster assignments and track joins/leaves"""
-        # Track previous cluster assignments
-        previous_assignments = {}
-        for vehicle_id, node in self.vehicle_nodes.items():
-            previous_assignments[vehicle_id] = node.cluster_id
-        
-        # Reset all cluster assignments
-        for node in self.vehicle_nodes.values():
-            node.cluster_id = ""
-            node.is_cluster_head = False
+        vehicle_nodes = self.vehicle_nodes
+        vehicle_of = self._vehicle_of
+        statistics = self.statistics
+        create_leave = self.message_processor.create_leave_notification
+        create_join = self.message_processor.create_join_request
+        debug = self.logger.debug
+        log_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        
+        # Collect the new assignments (vehicle -> (cluster, is_head)) and the
+        # join/leave events. Node cluster IDs still hold the previous assignment
+        # here, so they are compared against directly instead of copied first.
+        new_assignments: Dict[str, Tuple[str, bool]] = {}
+        notifications: List[VANETMessage] = []
         
-        # Update with current assignments and send join messages
         for cluster_id, cluster in clusters.items():
             # Update cluster head
-            if cluster.head_id in self.vehicle_nodes:
-                head_node = self.vehicle_nodes[cluster.head_id]
-                head_node.cluster_id = cluster_id
-                head_node.is_cluster_head = True
+            head_node = vehicle_nodes.get(cluster.head_id)
+            if head_node is not None:
+                new_assignments[cluster.head_id] = (cluster_id, True)
                 
                 # Track cluster join/change for head
-                previous_cluster = previous_assignments.get(cluster.head_id, "")
+                previous_cluster = head_node.cluster_id
                 if previous_cluster != cluster_id:
                     if previous_cluster:
-                        self.statistics['cluster_leaves'] += 1
-                        self.logger.debug(f"Head {cluster.head_id} left cluster {previous_cluster}")
+                        statistics['cluster_leaves'] += 1
+                        if log_enabled:
+                            debug("Head %s left cluster %s", cluster.head_id, previous_cluster)
                     if cluster_id:
-                        self.statistics['cluster_joins'] += 1
-                        self.logger.debug(f"Head {cluster.head_id} joined cluster {cluster_id}")
+                        statistics['cluster_joins'] += 1
+                        if log_enabled:
+                            debug("Head %s joined cluster %s", cluster.head_id, cluster_id)
             
-            # Update cluster members and send join requests
+            # Update cluster members and queue join requests
             for member_id in cluster.member_ids:
-                if member_id in self.vehicle_nodes:
-                    member_node = self.vehicle_nodes[member_id]
-                    member_node.cluster_id = cluster_id
-                    member_node.is_cluster_head = False
-                    
-                    # Track cluster join/change for member
-                    previous_cluster = previous_assignments.get(member_id, "")
-                    if previous_cluster != cluster_id:
-                        if previous_cluster:
-                            self.statistics['cluster_leaves'] += 1
-                            self.logger.debug(f"Vehicle {member_id} left cluster {previous_cluster}")
-                            # Send leave notification
-                            vehicle = member_node.to_vehicle()
-                            leave_message = self.message_processor.create_leave_notification(
-                                vehicle, previous_cluster
-                            )
-                            self._send_message(leave_message)
-                        
-                        if cluster_id:
-                            self.statistics['cluster_joins'] += 1
-                            self.logger.debug(f"Vehicle {member_id} joined cluster {cluster_id}")
-                            # Send join request
-                            vehicle = member_node.to_vehicle()
-                            # Find cluster head for target
-                            target_head_id = cluster.head_id if cluster.head_id else cluster_id
-                            join_message = self.message_processor.create_join_request(
-                                vehicle, cluster_id, target_head_id
-                            )
-                            self._send_message(join_message)
+                member_node = vehicle_nodes.get(member_id)
+                if member_node is None:
+                    continue
+                new_assignments[member_id] = (cluster_id, False)
+                
+                # Track cluster join/change for member
+                previous_cluster = member_node.cluster_id
+                if previous_cluster == cluster_id:
+                    continue
+                
+                vehicle = vehicle_of(member_node)
+                if previous_cluster:
+                    statistics['cluster_leaves'] += 1
+                    if log_enabled:
+                        debug("Vehicle %s left cluster %s", member_id, previous_cluster)
+                    # Queue leave notification
+                    notifications.append(create_leave(vehicle, previous_cluster))
+                
+                if cluster_id:
+                    statistics['cluster_joins'] += 1
+                    if log_enabled:
+                        debug("Vehicle %s joined cluster %s", member_id, cluster_id)
+                    # Queue join request, targeting the cluster head
+                    target_head_id = cluster.head_id if cluster.head_id else cluster_id
+                    notifications.append(create_join(vehicle, cluster_id, target_head_id))
+        
+        # Apply the new assignments; vehicles in no cluster are reset
+        set_cluster_id = self._set_cluster_id
+        unassigned = ("", False)
+        for vehicle_id, node in vehicle_nodes.items():
+            cluster_id, is_head = new_assignments.get(vehicle_id, unassigned)
+            set_cluster_id(node, cluster_id)
+            node.is_cluster_head = is_head
+        
+        if notifications:
+            self._send_messages(notifications)
     
     def _update_trust_from_cluster_stability(self, clusters: Dict[str, Cluster]):
         """Update trust scores based on cluster stability contributions"""
+        if not self.trust_enabled:
+            return
+        
+        vehicle_nodes = self.vehicle_nodes
+        cluster_metrics = self.cluster_manager.cluster_metrics
+        apply_delta = self._apply_cluster_behavior_delta
+        
         for cluster_id, cluster in clusters.items():
             # Get cluster metrics if available
-            metrics = self.cluster_manager.cluster_metrics.get(cluster_id)
+            metrics = cluster_metrics.get(cluster_id)
             if not metrics:
                 continue
             
+            # The adjustment depends only on the cluster, so work it out once
             stability_score = metrics.stability_score
+            member_delta = self._cluster_behavior_delta(stability_score, is_head=False)
+            if not member_delta:
+                continue  # Neutral stability leaves trust unchanged
             
             # Update trust for cluster head
-            if cluster.head_id in self.vehicle_nodes:
-                self.update_trust_on_cluster_behavior(
-                    cluster.head_id, 
-                    is_head=True, 
-                    stability_contribution=stability_score
-                )
+            head_node = vehicle_nodes.get(cluster.head_id)
+            if head_node is not None:
+                apply_delta((head_node,), self._cluster_behavior_delta(stability_score, is_head=True))
             
-            # Update trust for cluster members
-            for member_id in cluster.member_ids:
-                if member_id in self.vehicle_nodes:
-                    self.update_trust_on_cluster_behavior(
-                        member_id, 
-                        is_head=False, 
-                        stability_contribution=stability_score
-                    )
+            # Update trust for all cluster members in one batch
+            member_nodes = [vehicle_nodes[member_id] for member_id in cluster.member_ids
+                            if member_id in vehicle_nodes]
+            apply_delta(member_nodes, member_delta)
+            
+            self.logger.debug("Trust updated for cluster %s based on stability %.3f", cluster_id, stability_score)
     
     def _process_cluster_management_actions(self, actions: Dict[str, Any]):
         """Process cluster management actions"""
+        # Handlers share the message queue, statistics and the message processor's
+        # sequence counters, so actions are dispatched in order on this thread
         for cluster_id, action_info in actions.items():
-            action = action_info['action']
-            
-            if action == 'head_change':
-                self._handle_head_change(cluster_id, action_info)
-            elif action == 'merge_candidates':
-                self._handle_merge_candidates(cluster_id, action_info)
-            elif action == 'split_plan':
-                self._handle_split_plan(cluster_id, action_info)
+            handler = self._action_handlers.get(action_info['action'])
+            if handler:
+                handler(cluster_id, action_info)
     
     def _send_cluster_announcements(self, clusters: Dict[str, Cluster]):
         """Send cluster head announcements"""
@@ -1045,7 +1392,7 @@ class CustomVANETApplication:
                 if (self.current_time - head_node.last_cluster_update) >= \
                    self.config['cluster_announcement_interval']:
                     
-                    vehicle = head_node.to_vehicle()
+                    vehicle = self._vehicle_of(head_node)
                     message = self.message_processor.create_cluster_head_announcement(
                         vehicle, cluster
                     )
@@ -1062,7 +1409,7 @@ class CustomVANETApplication:
             new_node = self.vehicle_nodes[new_head]
             
             # Send handover message
-            old_vehicle = old_node.to_vehicle()
+            old_vehicle = self._vehicle_of(old_node)
             cluster = self.clustering_engine.clusters.get(cluster_id)
             
             if cluster:
@@ -1072,7 +1419,7 @@ class CustomVANETApplication:
                 self._send_message(message)
                 
                 self.statistics['head_elections'] += 1
-                self.logger.info(f"Cluster {cluster_id} head changed from {old_head} to {new_head}")
+                self.logger.info("Cluster %s head changed from %s to %s", cluster_id, old_head, new_head)
     
     def _handle_merge_candidates(self, cluster_id: str, action_info: Dict[str, Any]):
         """Handle cluster merge candidates"""
@@ -1083,10 +1430,10 @@ class CustomVANETApplication:
             head_node = self.vehicle_nodes.get(source_cluster.head_id)
             
             if head_node:
+                head_vehicle = self._vehicle_of(head_node)
                 for candidate_id in candidates:
                     if candidate_id in self.clustering_engine.clusters:
                         target_cluster = self.clustering_engine.clusters[candidate_id]
-                        head_vehicle = head_node.to_vehicle()
                         
                         message = self.message_processor.create_merge_request(
                             head_vehicle, source_cluster, candidate_id, target_cluster.head_id
@@ -1102,7 +1449,7 @@ class CustomVANETApplication:
             head_node = self.vehicle_nodes.get(cluster.head_id)
             
             if head_node:
-                head_vehicle = head_node.to_vehicle()
+                head_vehicle = self._vehicle_of(head_node)
                 split_groups = [plan['group1'], plan['group2']]
                 
                 message = self.message_processor.create_split_notification(
@@ -1134,8 +1481,8 @@ class CustomVANETApplication:
                 )
                 self._send_message(message)
                 
-                self.logger.info(f"Cluster {cluster_id} head handover from {departing_head_id} "
-                               f"to {new_head_node.vehicle_id}")
+                self.logger.info("Cluster %s head handover from %s to %s",
+                                 cluster_id, departing_head_id, new_head_node.vehicle_id)
     
     def _send_cluster_leave_notification(self, node: VehicleNode):
         """Send cluster leave notification"""
@@ -1148,20 +1495,9 @@ class CustomVANETApplication:
     
     def _handle_message_processing_result(self, message: VANETMessage, result: Dict[str, Any]):
         """Handle message processing result"""
-        action = result.get('action')
-        
-        if action == 'join_request_received':
-            self._handle_join_request(message, result)
-        elif action == 'join_response_received':
-            self._handle_join_response(message, result)
-        elif action == 'merge_request_received':
-            self._handle_merge_request(message, result)
-        elif action == 'merge_response_received':
-            self._handle_merge_response(message, result)
-        elif action == 'emergency_received':
-            self._handle_emergency_message(message, result)
-        elif action == 'update_neighbor':
-            self._update_neighbor_info(result)
+        handler = self._result_handlers.get(result.get('action'))
+        if handler:
+            handler(message, result)
     
     def _handle_join_request(self, message: VANETMessage, result: Dict[str, Any]):
         """Handle cluster join request"""
@@ -1211,13 +1547,14 @@ class CustomVANETApplication:
         if self.trust_enabled:
             # Reject malicious vehicles
             if self.is_node_malicious(message.source_id):
-                self.logger.warning(f"Join request rejected: vehicle {message.source_id} is malicious")
+                self.logger.warning("Join request rejected: vehicle %s is malicious", message.source_id)
                 return JoinResponseCode.JOIN_REJECTED_INCOMPATIBLE
             
             # Check minimum trust threshold for cluster membership
             requester_trust = self._get_vehicle_trust_score(message.source_id)
             if requester_trust < 0.4:  # Minimum trust for joining (lower than head threshold)
-                self.logger.info(f"Join request rejected: vehicle {message.source_id} trust score {requester_trust:.2f} too low")
+                self.logger.info("Join request rejected: vehicle %s trust score %.2f too low",
+                                 message.source_id, requester_trust)
                 return JoinResponseCode.JOIN_REJECTED_INCOMPATIBLE
         
         # Check compatibility (simplified)
@@ -1239,19 +1576,19 @@ class CustomVANETApplication:
             if message.destination_id in self.vehicle_nodes:
                 node = self.vehicle_nodes[message.destination_id]
                 old_cluster = node.cluster_id
-                node.cluster_id = message.cluster_id
+                self._set_cluster_id(node, message.cluster_id)
                 node.is_cluster_head = False
                 
                 # Track cluster join event
                 self.statistics['cluster_joins'] += 1
-                self.logger.info(f"Vehicle {message.destination_id} joined cluster {message.cluster_id}")
+                self.logger.info("Vehicle %s joined cluster %s", message.destination_id, message.cluster_id)
                 
                 # If vehicle was in another cluster, track leave event
                 if old_cluster and old_cluster != message.cluster_id:
                     self.statistics['cluster_leaves'] += 1
-                    self.logger.info(f"Vehicle {message.destination_id} left cluster {old_cluster}")
+                    self.logger.info("Vehicle %s left cluster %s", message.destination_id, old_cluster)
         else:
-            self.logger.info(f"Vehicle {message.destination_id} join rejected: {result['reason']}")
+            self.logger.info("Vehicle %s join rejected: %s", message.destination_id, result['reason'])
     
     def _handle_merge_request(self, message: VANETMessage, result: Dict[str, Any]):
         """Handle cluster merge request"""
@@ -1276,21 +1613,21 @@ class CustomVANETApplication:
     def _handle_merge_response(self, message: VANETMessage, result: Dict[str, Any]):
         """Handle cluster merge response"""
         if result['accepted']:
-            self.logger.info(f"Cluster merge accepted between {result['source_cluster']} "
-                           f"and {result['target_cluster']}")
+            self.logger.info("Cluster merge accepted between %s and %s",
+                             result['source_cluster'], result['target_cluster'])
         else:
-            self.logger.info(f"Cluster merge rejected")
+            self.logger.info("Cluster merge rejected")
     
     def _handle_emergency_message(self, message: VANETMessage, result: Dict[str, Any]):
         """Handle emergency message"""
-        self.logger.warning(f"Emergency message from {result['source']}: {result['data']}")
+        self.logger.warning("Emergency message from %s: %s", result['source'], result['data'])
         
         # Forward emergency message if needed
         if result.get('requires_forwarding'):
             # Implement emergency message forwarding logic
             pass
     
-    def _update_neighbor_info(self, result: Dict[str, Any]):
+    def _update_neighbor_info(self, message: VANETMessage, result: Dict[str, Any]):
         """Update neighbor information from beacon"""
         vehicle_id = result['vehicle_id']
         
@@ -1300,19 +1637,21 @@ class CustomVANETApplication:
             node.speed = result['speed']
             node.direction = result['direction']
             node.last_update = self.current_time
+            self.vehicle_store.update(vehicle_id, *node.location)
+            self._track_update(vehicle_id, node.last_update)
             
             # Update cluster info
             cluster_info = result['cluster_info']
             if cluster_info['cluster_id']:
-                node.cluster_id = cluster_info['cluster_id']
+                self._set_cluster_id(node, cluster_info['cluster_id'])
                 node.is_cluster_head = cluster_info['is_head']
     
     def _send_message(self, message: VANETMessage) -> bool:
         """Send message through the network"""
         try:
             # Add to message queue (simulation of network transmission)
-            message_id = f"{message.source_id}_{message.sequence_number}_{self.current_time}"
-            self.message_queue[message_id] = message.to_dict()
+            message_id = (message.source_id, message.sequence_number, self.current_time)
+            self.message_queue[message_id] = self._in_flight(message)
             
             self.statistics['messages_sent'] += 1
             
@@ -1323,7 +1662,7 @@ class CustomVANETApplication:
             return True
             
         except Exception as e:
-            self.logger.error(f"Error sending message: {e}")
+            self.logger.error("Error sending message: %s", e)
             
             # Penalize trust for failed message sending
             if self.trust_enabled:
@@ -1331,138 +1670,244 @@ class CustomVANETApplication:
             
             return False
     
+    def _send_messages(self, messages: List[VANETMessage]):
+        """Send a batch of messages through the network in one queue update"""
+        queued = {}
+        sent = []
+        
+        for message in messages:
+            try:
+                message_id = (message.source_id, message.sequence_number, self.current_time)
+                queued[message_id] = self._in_flight(message)
+                sent.append(message)
+            except Exception as e:
+                self.logger.error("Error sending message: %s", e)
+                
+                # Penalize trust for failed message sending
+                if self.trust_enabled:
+                    self.update_trust_on_message_delivery(message.source_id, success=False)
+        
+        self.message_queue.update(queued)
+        self.statistics['messages_sent'] += len(sent)
+        
+        # Update trust for successful message creation
+        if self.trust_enabled:
+            update_trust = self.update_trust_on_message_delivery
+            for message in sent:
+                update_trust(message.source_id, success=True)
+    
+    @staticmethod
+    def _in_flight(message: VANETMessage) -> VANETMessage:
+        """Prepare a message for the in-process queue (no dict round trip)"""
+        # A zero timestamp used to be replaced with wall-clock time when the queued
+        # dict was parsed back; stamp it here so delivery timing is unchanged
+        if message.timestamp == 0.0:
+            message.timestamp = time.time()
+        return message
+    
     def _process_message_queue(self):
         """Process pending messages in queue"""
-        messages_to_remove = []
+        # Drain the queue; messages sent while draining land in a fresh one
+        queued, self.message_queue = self.message_queue, {}
+        retained: Dict[Any, Any] = {}
+        
+        # Group deliveries by destination and hand them over in one batch per vehicle
+        self._pending_deliveries = defaultdict(list)
         
-        for message_id, message_data in self.message_queue.items():
+        from_dict = VANETMessage.from_dict
+        should_deliver = self._should_deliver_message
+        route = self._route_message_to_vehicles
+        current_time = self.current_time
+        
+        for message_id, message_data in queued.items():
             # Simulate message transmission delay and processing
             try:
-                message = VANETMessage.from_dict(message_data)
+                # Messages sent in-process are queued as objects; raw dicts are parsed
+                if message_data.__class__ is VANETMessage:
+                    message = message_data
+                else:
+                    message = from_dict(message_data)
                 
                 # Check if message should be delivered
-                if self._should_deliver_message(message):
+                if should_deliver(message):
                     # Route message to appropriate vehicles
-                    self._route_message_to_vehicles(message, message_data)
-                    messages_to_remove.append(message_id)
-                elif message.is_expired(self.current_time):
-                    messages_to_remove.append(message_id)
+                    route(message, message_data)
+                elif not message.is_expired(current_time):
+                    # Not deliverable yet - keep it queued
+                    retained[message_id] = message_data
                     
             except Exception as e:
-                self.logger.error(f"Error processing queued message {message_id}: {e}")
-                messages_to_remove.append(message_id)
+                self.logger.error("Error processing queued message %s: %s", message_id, e)
+        
+        pending_deliveries, self._pending_deliveries = self._pending_deliveries, None
         
-        # Remove processed/expired messages
-        for message_id in messages_to_remove:
-            del self.message_queue[message_id]
+        # Count the whole pass once instead of once per destination vehicle
+        self.statistics['messages_received'] += sum(map(len, pending_deliveries.values()))
+        deliver = self._deliver_messages_to_vehicle
+        for vehicle_id, messages in pending_deliveries.items():
+            deliver(messages, vehicle_id, counted=True)
+        
+        # Undelivered messages stay ahead of the ones sent during this pass
+        retained.update(self.message_queue)
+        self.message_queue = retained
     
     def _route_message_to_vehicles(self, message: VANETMessage, message_data: Dict[str, Any]):
         """Route message to appropriate vehicles based on type and proximity"""
-        # Get sender location for proximity-based routing
+        # Messages from vehicles that have since left the network are dropped
         sender_node = self.vehicle_nodes.get(message.source_id)
         if not sender_node:
             return
         
+        if message.message_type in _CLUSTERING_MSG_TYPES:
+            # Clustering messages go to cluster members or nearby vehicles
+            cluster_id = message.cluster_id
+            if cluster_id:
+                self._deliver_to_cluster_members(message, message_data, cluster_id)
+                return
+        
+        # Beacons, clustering messages without a cluster and broadcasts go to
+        # every vehicle within communication range of the sender
         sender_x, sender_y = sender_node.location
         communication_range = 300.0  # meters
+        self._deliver_to_nearby_vehicles(message, message_data, sender_x, sender_y, communication_range)
+    
+    def _deliver_to_nearby_vehicles(self, message: VANETMessage, message_data: Dict[str, Any],
+                                   sender_x: float, sender_y: float, range_meters: float):
+        """Deliver message to vehicles within communication range"""
+        # Vectorized range query over the SoA position store (sender excluded)
+        nearby = self.vehicle_store.neighbor_ids_within(
+            sender_x, sender_y, range_meters, exclude=message.source_id
+        )
+        self._deliver_to_recipients(message, message_data, nearby)
+        delivered_count = len(nearby)
         
-        # Determine target vehicles based on message type
-        if message.message_type == 'BEACON':
-            # Beacon messages go to nearby vehicles
-            self._deliver_to_nearby_vehicles(message_data, sender_x, sender_y, communication_range)
-        
-        elif message.message_type in ['CLUSTER_JOIN_REQUEST', 'CLUSTER_HEAD_ANNOUNCEMENT', 
-                                      'CLUSTER_HEARTBEAT', 'CLUSTER_ELECTION']:
-            # Clustering messages go to cluster members or nearby vehicles
-            if hasattr(message, 'cluster_id') and message.cluster_id:
-                self._deliver_to_cluster_members(message_data, message.cluster_id)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            if delivered_count > 0:
+                self.logger.debug("Delivered %s message to %d nearby vehicles", message.message_type, delivered_count)
             else:
-                self._deliver_to_nearby_vehicles(message_data, sender_x, sender_y, communication_range)
+                self.logger.debug("No vehicles in range for %s message from %s", message.message_type, message.source_id)
+    
+    def _deliver_to_cluster_members(self, message: VANETMessage, message_data: Dict[str, Any],
+                                    cluster_id: str):
+        """Deliver message to all members of a specific cluster"""
+        members = self._cluster_members.get(cluster_id, ())
         
-        elif hasattr(message, 'target_id') and message.target_id:
-            # Targeted message
-            if message.target_id in self.vehicle_nodes:
-                self.receive_message(message_data)
+        # Don't deliver to sender
+        recipients = [vehicle_id for vehicle_id in members if vehicle_id != message.source_id]
+        self._deliver_to_recipients(message, message_data, recipients)
+        delivered_count = len(recipients)
         
-        else:
-            # Broadcast message
-            self._deliver_to_nearby_vehicles(message_data, sender_x, sender_y, communication_range)
+        if delivered_count > 0 and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Delivered %s message to %d cluster members", message.message_type, delivered_count)
     
-    def _deliver_to_nearby_vehicles(self, message_data: Dict[str, Any], sender_x: float, 
-                                   sender_y: float, range_meters: float):
-        """Deliver message to vehicles within communication range"""
-        message = VANETMessage.from_dict(message_data)
-        delivered_count = 0
+    def _set_cluster_id(self, node: VehicleNode, cluster_id: str):
+        """Assign a node to a cluster, keeping the cluster member index current"""
+        node.cluster_id = cluster_id
+        self._index_cluster_membership(node.vehicle_id, cluster_id)
+    
+    def _index_cluster_membership(self, vehicle_id: str, cluster_id: str):
+        """Move a vehicle between cluster member sets"""
+        old_cluster = self._member_cluster.get(vehicle_id, "")
+        if old_cluster == cluster_id:
+            return
         
-        for vehicle_id, node in self.vehicle_nodes.items():
-            if vehicle_id == message.source_id:
-                continue  # Don't deliver to sender
-            
-            # Calculate distance
-            node_x, node_y = node.location
-            distance = ((sender_x - node_x) ** 2 + (sender_y - node_y) ** 2) ** 0.5
-            
-            if distance <= range_meters:
-                self._deliver_message_to_vehicle(message_data, vehicle_id)
-                delivered_count += 1
+        if old_cluster:
+            members = self._cluster_members[old_cluster]
+            members.pop(vehicle_id, None)
+            if not members:
+                del self._cluster_members[old_cluster]
         
-        if delivered_count > 0:
-            self.logger.debug(f"Delivered {message.message_type} message to {delivered_count} nearby vehicles")
+        if cluster_id:
+            self._cluster_members[cluster_id][vehicle_id] = None
+            self._member_cluster[vehicle_id] = cluster_id
         else:
-            self.logger.debug(f"No vehicles in range for {message.message_type} message from {message.source_id}")
+            self._member_cluster.pop(vehicle_id, None)
     
-    def _deliver_to_cluster_members(self, message_data: Dict[str, Any], cluster_id: str):
-        """Deliver message to all members of a specific cluster"""
-        message = VANETMessage.from_dict(message_data)
-        delivered_count = 0
-        
+    def _sync_cluster_members(self):
+        """Pick up ``node.cluster_id`` writes made outside the application"""
+        member_cluster = self._member_cluster
         for vehicle_id, node in self.vehicle_nodes.items():
-            if vehicle_id == message.source_id:
-                continue  # Don't deliver to sender
-            
-            if node.cluster_id == cluster_id:
-                self._deliver_message_to_vehicle(message_data, vehicle_id)
-                delivered_count += 1
+            if member_cluster.get(vehicle_id, "") != node.cluster_id:
+                self._index_cluster_membership(vehicle_id, node.cluster_id)
+    
+    def _deliver_to_recipients(self, message: VANETMessage, message_data: Dict[str, Any],
+                               recipients: List[str]):
+        """Deliver one message to many vehicles"""
+        delivery = (message_data, message)
+        
+        # While the queue is being processed, add to every recipient's batch in one pass
+        pending = self._pending_deliveries
+        if pending is not None:
+            for vehicle_id in recipients:
+                pending[vehicle_id].append(delivery)
+            return
         
-        if delivered_count > 0:
-            self.logger.debug(f"Delivered {message.message_type} message to {delivered_count} cluster members")
+        for vehicle_id in recipients:
+            self._deliver_messages_to_vehicle([delivery], vehicle_id)
     
-    def _deliver_message_to_vehicle(self, message_data: Dict[str, Any], vehicle_id: str):
-        """Deliver a message to a specific vehicle"""
+    def _deliver_message_to_vehicle(self, message_data: Dict[str, Any], vehicle_id: str,
+                                    message: Optional[VANETMessage] = None):
+        """Deliver a message to a specific vehicle (``message`` is the parsed form, if known)"""
+        # While the queue is being processed, batch the delivery by destination
+        if self._pending_deliveries is not None:
+            self._pending_deliveries[vehicle_id].append((message_data, message))
+            return
+        
+        self._deliver_messages_to_vehicle([(message_data, message)], vehicle_id)
+    
+    def _deliver_messages_to_vehicle(self, deliveries: List[Tuple[Dict[str, Any], Optional[VANETMessage]]],
+                                     vehicle_id: str, counted: bool = False):
+        """Deliver a batch of (message_data, parsed message) pairs to a specific vehicle
+
+        ``counted`` means the caller has already added the batch to ``messages_received``.
+        """
         # In a real VANET system, each vehicle would have its own application instance
         # For simulation, we track deliveries to different vehicles
-        self.logger.debug(f"Delivering message {message_data.get('message_type', 'UNKNOWN')} to vehicle {vehicle_id}")
+        self.logger.debug("Delivering %d message(s) to vehicle %s", len(deliveries), vehicle_id)
         
-        # Increment received message counter for this delivery
-        self.statistics['messages_received'] += 1
+        # Increment received message counter for these deliveries
+        if not counted:
+            self.statistics['messages_received'] += len(deliveries)
         
-        # Add message to vehicle's buffer
-        if vehicle_id in self.vehicle_nodes:
-            node = self.vehicle_nodes[vehicle_id]
-            node.message_buffer.append(message_data)
+        # Add messages to vehicle's buffer
+        node = self.vehicle_nodes.get(vehicle_id)
+        if node is not None:
+            # The bounded deque drops the oldest entries itself as the batch goes in
+            node.message_buffer.extend(map(_delivery_payload, deliveries))
             
-            # Process the message for this vehicle
-            self._process_received_message(message_data, vehicle_id)
-    
-    def _process_received_message(self, message_data: Dict[str, Any], receiver_id: str):
+            # Process the messages for this vehicle; only beacons and the received
+            # clustering types have per-receiver handling, the rest are just buffered
+            process = self._process_received_message
+            for message_data, message in deliveries:
+                if message is None:
+                    process(message_data, vehicle_id)
+                    continue
+                if message.message_type in _PROCESS_ON_RECEIVE_TYPES:
+                    process(message_data, vehicle_id, message)
+    
+    def _process_received_message(self, message_data: Dict[str, Any], receiver_id: str,
+                                  message: Optional[VANETMessage] = None):
         """Process a message received by a specific vehicle"""
         try:
-            message = VANETMessage.from_dict(message_data)
+            # Queue processing always passes the parsed message; only direct
+            # callers of the single-delivery API may leave it to be parsed here
+            if message is None:
+                message = VANETMessage.from_dict(message_data)
             
             # Update neighbor information from beacons
-            if message.message_type == 'BEACON' and receiver_id in self.vehicle_nodes:
+            if message.message_type is VANETMessageType.BEACON and receiver_id in self.vehicle_nodes:
                 receiver_node = self.vehicle_nodes[receiver_id]
                 receiver_node.neighbors.add(message.source_id)
             
             # Handle cluster-specific messages
-            elif message.message_type in ['CLUSTER_JOIN_REQUEST', 'CLUSTER_HEAD_ANNOUNCEMENT']:
+            elif message.message_type in _RECEIVED_CLUSTERING_TYPES:
                 # Process clustering messages
                 result = self.message_processor.process_message(message, self.current_time)
                 if result:
                     self._handle_message_processing_result(message, result)
             
         except Exception as e:
-            self.logger.error(f"Error processing received message for {receiver_id}: {e}")
+            self.logger.error("Error processing received message for %s: %s", receiver_id, e)
     
     def _should_deliver_message(self, message: VANETMessage) -> bool:
         """Determine if message should be delivered (improved routing)"""
@@ -1478,44 +1923,43 @@ class CustomVANETApplication:
         
         # Check if message is expired
         if message.is_expired(self.current_time):
-            self.logger.debug(f"Message {message.message_type} from {message.source_id} expired")
+            self.logger.debug("Message %s from %s expired", message.message_type, message.source_id)
             return False
         
-        # For clustering messages, always deliver after delay
-        if message.message_type in ['BEACON', 'CLUSTER_JOIN_REQUEST', 'CLUSTER_HEAD_ANNOUNCEMENT',
-                                     'CLUSTER_HEARTBEAT', 'CLUSTER_ELECTION', 'CLUSTER_HANDOVER',
-                                     'CLUSTER_MERGE_REQUEST', 'CLUSTER_SPLIT_NOTIFICATION',
-                                     'CLUSTER_LEAVE_NOTIFICATION', 'CLUSTER_JOIN_RESPONSE']:
-            return True
-        
-        # For targeted messages, check if target exists
-        if hasattr(message, 'target_id') and message.target_id:
-            return message.target_id in self.vehicle_nodes
-        
-        # For data and emergency messages, deliver to nearby vehicles
-        if message.message_type in ['DATA', 'EMERGENCY']:
-            return True
-        
-        # Broadcast messages - deliver after delay
+        # Clustering, data, emergency and broadcast messages - deliver after delay
         return True
     
     def _cleanup_old_data(self):
         """Clean up old data and expired elements"""
         current_time = self.current_time
+        timeout = self.config['neighbor_timeout']
+        heap = self._update_heap
         
-        # Clean up old neighbor information
+        # Clean up old neighbor information, popping only entries old enough to expire
         vehicles_to_remove = []
-        for vehicle_id, node in self.vehicle_nodes.items():
-            if (current_time - node.last_update) > self.config['neighbor_timeout']:
+        refreshed = []
+        while heap and (current_time - heap[0][0]) > timeout:
+            last_update, vehicle_id = heapq.heappop(heap)
+            node = self.vehicle_nodes.get(vehicle_id)
+            if node is None:
+                continue  # Vehicle already removed
+            if node.last_update == last_update:
                 vehicles_to_remove.append(vehicle_id)
+            else:
+                # Refreshed since (possibly by a direct write), so track its newer timestamp
+                refreshed.append((node.last_update, vehicle_id))
         
-        for vehicle_id in vehicles_to_remove:
-            self.remove_vehicle(vehicle_id)
+        for entry in refreshed:
+            if (current_time - entry[0]) > timeout:
+                vehicles_to_remove.append(entry[1])
+            else:
+                heapq.heappush(heap, entry)
         
-        # Clean up message buffers
-        for node in self.vehicle_nodes.values():
-            if len(node.message_buffer) > self.config['max_message_buffer_size']:
-                node.message_buffer = node.message_buffer[-self.config['max_message_buffer_size']:]
+        for vehicle_id in dict.fromkeys(vehicles_to_remove):
+            if vehicle_id in self.vehicle_nodes:
+                self.remove_vehicle(vehicle_id)
+        
+        # Message buffers are bounded deques, so they need no trimming here
     
     def get_application_statistics(self) -> Dict[str, Any]:
         """Get comprehensive application statistics"""
@@ -1549,8 +1993,17 @@ class CustomVANETApplication:
     
     def set_configuration(self, config_updates: Dict[str, Any]):
         """Update application configuration"""
+        old_buffer_size = self.config['max_message_buffer_size']
         self.config.update(config_updates)
-        self.logger.info(f"Configuration updated: {config_updates}")
+        self._clustering_dirty = True
+        
+        # Re-bound existing message buffers if their size limit changed
+        max_size = self.config['max_message_buffer_size']
+        if max_size != old_buffer_size:
+            for node in self.vehicle_nodes.values():
+                if node.message_buffer.maxlen != max_size:
+                    node.message_buffer = deque(node.message_buffer, maxlen=max_size)
+        self.logger.info("Configuration updated: %s", config_updates)
     
     def get_cluster_info(self, vehicle_id: str) -> Optional[Dict[str, Any]]:
         """Get cluster information for a specific vehicle"""
@@ -1579,11 +2032,10 @@ class CustomVANETApplication:
     
     def _calculate_network_participation(self, node_id: str) -> float:
         """Calculate network participation score for a node"""
-        if node_id not in self.vehicle_nodes:
+        node = self.vehicle_nodes.get(node_id)
+        if node is None:
             return 0.0
         
-        node = self.vehicle_nodes[node_id]
-        
         # Base participation on message activity and cluster involvement
         message_activity = min(len(node.message_buffer) / 50.0, 1.0)  # Normalize to 0-1
         cluster_participation = 1.0 if node.cluster_id else 0.5
@@ -1593,12 +2045,12 @@ class CustomVANETApplication:
     
     def _calculate_response_reliability(self, node_id: str) -> float:
         """Calculate response reliability score for a node"""
-        if node_id not in self.vehicle_nodes:
+        node = self.vehicle_nodes.get(node_id)
+        if node is None:
             return 0.0
         
         # In a real implementation, this would track message response rates
         # For simulation, we'll use a baseline score with some variance
-        node = self.vehicle_nodes[node_id]
         
         # Factor in how long the node has been active
         activity_duration = self.current_time - (node.last_update - 3600)  # Assume 1 hour max
@@ -1632,34 +2084,33 @@ class CustomVANETApplication:
     
     def _handle_malicious_node_detected(self, node_id: str, malicious_activity: MaliciousActivity):
         """Handle detection of malicious node"""
-        self.logger.warning(f"Malicious node detected: {node_id} - {malicious_activity.activity_type}")
+        self.logger.warning("Malicious node detected: %s - %s", node_id, malicious_activity.activity_type)
         
         # Update statistics
         self.statistics['malicious_nodes_detected'] += 1
         
         # Mark node as malicious
-        if node_id in self.vehicle_nodes:
-            node = self.vehicle_nodes[node_id]
+        node = self.vehicle_nodes.get(node_id)
+        if node is not None:
             node.is_malicious = True
             node.trust_score = min(node.trust_score, 0.2)  # Significantly reduce trust
-        
-        # If node is cluster head, trigger head change
-        if node_id in self.vehicle_nodes and self.vehicle_nodes[node_id].is_cluster_head:
-            self._handle_malicious_cluster_head(node_id)
+            
+            # If node is cluster head, trigger head change
+            if node.is_cluster_head:
+                self._handle_malicious_cluster_head(node_id)
         
         # Broadcast warning to other nodes
         self._broadcast_malicious_node_warning(node_id, malicious_activity)
     
     def _handle_malicious_cluster_head(self, head_id: str):
         """Handle malicious cluster head detection"""
-        self.logger.warning(f"Malicious cluster head detected: {head_id}")
+        self.logger.warning("Malicious cluster head detected: %s", head_id)
         
         # Force immediate head election in the cluster
-        if head_id in self.vehicle_nodes:
-            cluster_id = self.vehicle_nodes[head_id].cluster_id
-            if cluster_id and cluster_id in self.clustering_engine.clusters:
-                cluster = self.clustering_engine.clusters[cluster_id]
-                
+        node = self.vehicle_nodes.get(head_id)
+        if node is not None:
+            cluster = self.clustering_engine.clusters.get(node.cluster_id) if node.cluster_id else None
+            if cluster is not None:
                 # Remove malicious head
                 cluster.member_ids.discard(head_id)
                 if head_id == cluster.head_id:
@@ -1668,25 +2119,24 @@ class CustomVANETApplication:
     
     def _emergency_head_election(self, cluster: Cluster):
         """Perform emergency head election due to malicious head"""
-        self.logger.info(f"Emergency head election for cluster {cluster.id}")
+        self.logger.info("Emergency head election for cluster %s", cluster.id)
         
         if not cluster.member_ids:
             # No members left, dissolve cluster
             del self.clustering_engine.clusters[cluster.id]
             return
         
-        # Select new head based on highest trust score
-        best_candidate = None
-        best_trust_score = 0.0
-        
-        for member_id in cluster.member_ids:
-            if member_id in self.vehicle_nodes and not self.vehicle_nodes[member_id].is_malicious:
-                trust_score = self.vehicle_nodes[member_id].trust_score
-                if trust_score > best_trust_score:
-                    best_trust_score = trust_score
-                    best_candidate = member_id
+        # Select new head based on highest trust score; a single max() pass, since
+        # trust scores are written in many places and an election reads them once
+        vehicle_nodes = self.vehicle_nodes
+        candidates = (
+            (node.trust_score, member_id)
+            for member_id, node in zip(cluster.member_ids, map(vehicle_nodes.get, cluster.member_ids))
+            if node is not None and not node.is_malicious
+        )
+        best_trust_score, best_candidate = max(candidates, key=itemgetter(0), default=(0.0, None))
         
-        if best_candidate:
+        if best_candidate and best_trust_score > 0.0:
             # Update cluster head
             old_head = cluster.head_id
             cluster.head_id = best_candidate
@@ -1697,7 +2147,7 @@ class CustomVANETApplication:
             
             self.vehicle_nodes[best_candidate].is_cluster_head = True
             
-            self.logger.info(f"New cluster head elected: {best_candidate} for cluster {cluster.id}")
+            self.logger.info("New cluster head elected: %s for cluster %s", best_candidate, cluster.id)
             self.statistics['head_elections'] += 1
     
     def _broadcast_malicious_node_warning(self, node_id: str, malicious_activity: MaliciousActivity):
@@ -1733,20 +2183,35 @@ class CustomVANETApplication:
         # Process the message if we're an authority node
         response = self.consensus_engine.process_message(message)
         if response:
-            self.logger.debug(f"Generated consensus response: {response.msg_type}")
+            self.logger.debug("Generated consensus response: %s", response.msg_type)
     
     def get_trust_statistics(self) -> Dict[str, Any]:
         """Get trust and security statistics"""
         if not self.trust_enabled or not self.consensus_engine:
             return {'trust_enabled': False}
         
-        trusted_nodes = sum(1 for node in self.vehicle_nodes.values() 
-                          if node.trust_score >= self.trusted_threshold)
-        malicious_nodes = sum(1 for node in self.vehicle_nodes.values() 
-                            if node.is_malicious)
-        
-        trust_scores = [node.trust_score for node in self.vehicle_nodes.values()]
-        avg_trust = sum(trust_scores) / len(trust_scores) if trust_scores else 0.0
+        nodes = self.vehicle_nodes.values()
+        trusted_threshold = self.trusted_threshold
+        
+        if NUMPY_AVAILABLE and nodes:
+            # Gather the columns once and reduce them in C
+            count = len(nodes)
+            trust_scores = np.fromiter((node.trust_score for node in nodes), dtype=np.float64, count=count)
+            malicious = np.fromiter((node.is_malicious for node in nodes), dtype=np.bool_, count=count)
+            trusted_nodes = int(np.count_nonzero(trust_scores >= trusted_threshold))
+            malicious_nodes = int(np.count_nonzero(malicious))
+            avg_trust = float(trust_scores.mean())
+        else:
+            # One pass collects the scores and counts flagged nodes
+            trust_scores = []
+            malicious_nodes = 0
+            for node in nodes:
+                trust_scores.append(node.trust_score)
+                if node.is_malicious:
+                    malicious_nodes += 1
+            
+            trusted_nodes = sum(1 for score in trust_scores if score >= trusted_threshold)
+            avg_trust = sum(trust_scores) / len(trust_scores) if trust_scores else 0.0
         
         consensus_stats = self.consensus_engine.get_consensus_statistics()
         
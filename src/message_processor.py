@@ -7,14 +7,24 @@ operations, complementing the OMNeT++ message definitions.
 
 import time
 import json
-from typing import Dict, List, Optional, Any, Set
-from dataclasses import dataclass, asdict
+from sys import intern
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Any, Set, Tuple, DefaultDict, Deque
+from dataclasses import dataclass, fields as dataclass_fields
+from operator import attrgetter
 from enum import Enum
 import logging
 
 from .clustering import Vehicle, Cluster
 from .cluster_manager import ClusterEvent, ClusterState
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    # orjson is optional - messages are encoded with the standard json module
+    ORJSON_AVAILABLE = False
+
 class MessageType(Enum):
     # Basic messages
     BEACON = 0
@@ -49,6 +59,24 @@ class MessageType(Enum):
     ROUTE_REQUEST = 52
     ROUTE_RESPONSE = 53
 
+# Clustering-related message types, see VANETMessage.is_clustering_message()
+_CLUSTERING_TYPES = frozenset({
+    MessageType.CLUSTER_HEAD_ANNOUNCEMENT,
+    MessageType.CLUSTER_JOIN_REQUEST,
+    MessageType.CLUSTER_JOIN_RESPONSE,
+    MessageType.CLUSTER_LEAVE_NOTIFICATION,
+    MessageType.CLUSTER_HEARTBEAT,
+    MessageType.CLUSTER_HEAD_ELECTION,
+    MessageType.CLUSTER_HEAD_HANDOVER,
+    MessageType.CLUSTER_MERGE_REQUEST,
+    MessageType.CLUSTER_MERGE_RESPONSE,
+    MessageType.CLUSTER_SPLIT_NOTIFICATION
+})
+
+# Enum member lookups go through the class on every access; the beacon paths
+# run per vehicle, so they use this module-level reference instead
+_BEACON = MessageType.BEACON
+
 class JoinResponseCode(Enum):
     JOIN_ACCEPTED = 0
     JOIN_REJECTED_FULL = 1
@@ -61,7 +89,7 @@ class MergeResponseCode(Enum):
     MERGE_REJECTED_INCOMPATIBLE = 2
     MERGE_REJECTED_BUSY = 3
 
-@dataclass
+@dataclass(slots=True)
 class VANETMessage:
     """Python representation of VANET messages"""
     # Basic fields
@@ -160,39 +188,59 @@ class VANETMessage:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert message to dictionary for serialization"""
-        data = asdict(self)
-        # Convert enums to their values
-        data['message_type'] = self.message_type.value
-        data['cluster_state'] = self.cluster_state.value
-        data['join_response_code'] = self.join_response_code.value
-        data['merge_response_code'] = self.merge_response_code.value
+        # Flat copy instead of asdict(): only the list fields are mutable, and
+        # their items are plain strings/floats, so a shallow list copy suffices
+        data = dict(zip(_MESSAGE_FIELD_NAMES, _message_field_values(self)))
+        for name in _MESSAGE_LIST_FIELDS:
+            data[name] = list(data[name])
+        # Convert enums to their values (_value_ skips the slower .value property)
+        data['message_type'] = self.message_type._value_
+        data['cluster_state'] = self.cluster_state._value_
+        data['join_response_code'] = self.join_response_code._value_
+        data['merge_response_code'] = self.merge_response_code._value_
         return data
     
+    def to_json_bytes(self) -> bytes:
+        """Encode message as UTF-8 JSON for transmission"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self.to_dict())
+        return json.dumps(self.to_dict(), separators=(',', ':')).encode()
+    
+    @classmethod
+    def from_json_bytes(cls, payload: bytes) -> 'VANETMessage':
+        """Create message from UTF-8 JSON produced by to_json_bytes()"""
+        if ORJSON_AVAILABLE:
+            return cls.from_dict(orjson.loads(payload))
+        return cls.from_dict(json.loads(payload))
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'VANETMessage':
         """Create message from dictionary"""
-        # Convert enum values back to enums
-        data['message_type'] = MessageType(data['message_type'])
-        data['cluster_state'] = ClusterState(data['cluster_state'])
-        data['join_response_code'] = JoinResponseCode(data['join_response_code'])
-        data['merge_response_code'] = MergeResponseCode(data['merge_response_code'])
+        # Convert enum values back to enums (skipped for a dict that was already parsed)
+        for key, enum_type, members_by_value in _ENUM_FIELD_LOOKUPS:
+            value = data[key]
+            if value.__class__ is not enum_type:
+                member = members_by_value.get(value)
+                # Unknown values still go through the enum call so they raise ValueError
+                data[key] = member if member is not None else enum_type(value)
+        # Ids parsed from raw input are fresh strings each time; interning them lets
+        # the messages kept in message_history share one copy per vehicle/cluster
+        for key in _MESSAGE_ID_FIELDS:
+            value = data.get(key)
+            if value.__class__ is str:
+                data[key] = intern(value)
+        # Keyword arguments match the field names by identity first and fall back to a
+        # slow compare per name; keys decoded from JSON are never interned, which makes
+        # cls(**data) several times slower, so intern them when the first one isn't
+        for key in data:
+            if intern(key) is not key:
+                data = {intern(name): value for name, value in data.items()}
+            break
         return cls(**data)
     
     def is_clustering_message(self) -> bool:
         """Check if this is a clustering-related message"""
-        clustering_types = {
-            MessageType.CLUSTER_HEAD_ANNOUNCEMENT,
-            MessageType.CLUSTER_JOIN_REQUEST,
-            MessageType.CLUSTER_JOIN_RESPONSE,
-            MessageType.CLUSTER_LEAVE_NOTIFICATION,
-            MessageType.CLUSTER_HEARTBEAT,
-            MessageType.CLUSTER_HEAD_ELECTION,
-            MessageType.CLUSTER_HEAD_HANDOVER,
-            MessageType.CLUSTER_MERGE_REQUEST,
-            MessageType.CLUSTER_MERGE_RESPONSE,
-            MessageType.CLUSTER_SPLIT_NOTIFICATION
-        }
-        return self.message_type in clustering_types
+        return self.message_type in _CLUSTERING_TYPES
     
     def is_expired(self, current_time: float = None) -> bool:
         """Check if message has expired"""
@@ -204,19 +252,63 @@ class VANETMessage:
         
         return current_time > self.expiry_time
 
+# VANETMessage field names in declaration order, and a getter returning their values
+_MESSAGE_FIELD_NAMES = tuple(f.name for f in dataclass_fields(VANETMessage))
+_message_field_values = attrgetter(*_MESSAGE_FIELD_NAMES)
+
+# List-typed VANETMessage fields, copied by to_dict so its output never aliases the message
+_MESSAGE_LIST_FIELDS = ('member_list', 'neighbor_clusters', 'split_groups',
+                        'neighbor_ids', 'neighbor_distances', 'neighbor_signal_strengths')
+
+# Vehicle/cluster id fields of VANETMessage, interned by from_dict
+_MESSAGE_ID_FIELDS = ('source_id', 'destination_id', 'cluster_id', 'cluster_head_id')
+
+# Enum-typed VANETMessage fields, stored as raw values by to_dict
+_ENUM_FIELDS = (
+    ('message_type', MessageType),
+    ('cluster_state', ClusterState),
+    ('join_response_code', JoinResponseCode),
+    ('merge_response_code', MergeResponseCode)
+)
+
+# Enum fields with their value -> member map, which is much cheaper than calling the enum
+_ENUM_FIELD_LOOKUPS = tuple((key, enum_type, enum_type._value2member_map_)
+                            for key, enum_type in _ENUM_FIELDS)
+
+# Keys VANETMessage.from_dict() cannot do without
+REQUIRED_MESSAGE_FIELDS = frozenset(['source_id', *(key for key, _ in _ENUM_FIELDS)])
+
+# Messages kept per vehicle in MessageProcessor.message_history
+MESSAGE_HISTORY_SIZE = 100
+
 class MessageProcessor:
     """Processes and validates VANET clustering messages"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.message_history: Dict[str, List[VANETMessage]] = {}
+        self.message_history: Dict[str, Deque[VANETMessage]] = {}
         self.pending_responses: Dict[str, VANETMessage] = {}
-        self.message_sequence_counters: Dict[str, int] = {}
+        self.message_sequence_counters: DefaultDict[str, int] = defaultdict(int)
+        
+        # Message type handlers; other types are processed as emergency or data messages
+        self._type_handlers = {
+            MessageType.BEACON: self._process_beacon,
+            MessageType.CLUSTER_HEAD_ANNOUNCEMENT: self._process_head_announcement,
+            MessageType.CLUSTER_JOIN_REQUEST: self._process_join_request,
+            MessageType.CLUSTER_JOIN_RESPONSE: self._process_join_response,
+            MessageType.CLUSTER_LEAVE_NOTIFICATION: self._process_leave_notification,
+            MessageType.CLUSTER_HEARTBEAT: self._process_heartbeat,
+            MessageType.CLUSTER_HEAD_ELECTION: self._process_election_message,
+            MessageType.CLUSTER_HEAD_HANDOVER: self._process_handover_message,
+            MessageType.CLUSTER_MERGE_REQUEST: self._process_merge_request,
+            MessageType.CLUSTER_MERGE_RESPONSE: self._process_merge_response,
+            MessageType.CLUSTER_SPLIT_NOTIFICATION: self._process_split_notification
+        }
     
     def create_beacon_message(self, vehicle: Vehicle, cluster: Optional[Cluster] = None) -> VANETMessage:
         """Create a beacon message for a vehicle"""
         message = VANETMessage(
-            message_type=MessageType.BEACON,
+            message_type=_BEACON,
             source_id=vehicle.id,
             position=(vehicle.x, vehicle.y),
             speed=vehicle.speed,
@@ -234,6 +326,40 @@ class MessageProcessor:
         
         return message
     
+    def create_beacon_messages(self, vehicles: List[Vehicle], clusters: List[Optional[Cluster]],
+                               timestamp: float) -> List[VANETMessage]:
+        """Create beacon messages for several vehicles sharing one timestamp"""
+        messages = []
+        next_sequence = self._get_next_sequence
+        # Cluster fields are shared by all members, so work them out once per cluster
+        cluster_fields: Dict[str, Tuple[str, str, int]] = {}
+        
+        for vehicle, cluster in zip(vehicles, clusters):
+            message = VANETMessage(
+                message_type=_BEACON,
+                source_id=vehicle.id,
+                position=(vehicle.x, vehicle.y),
+                speed=vehicle.speed,
+                direction=vehicle.direction,
+                lane_id=vehicle.lane_id,
+                timestamp=timestamp,
+                sequence_number=next_sequence(vehicle.id)
+            )
+            # A zero timestamp is replaced with wall-clock time in __post_init__
+            message.timestamp = timestamp
+            
+            if cluster:
+                fields = cluster_fields.get(cluster.id)
+                if fields is None:
+                    fields = cluster_fields[cluster.id] = (cluster.id, cluster.head_id, cluster.size())
+                message.cluster_id, message.cluster_head_id, message.member_count = fields
+                message.is_cluster_head = (fields[1] == vehicle.id)
+                message.cluster_radius = 300.0  # Default radius
+            
+            messages.append(message)
+        
+        return messages
+    
     def create_cluster_head_announcement(self, vehicle: Vehicle, cluster: Cluster) -> VANETMessage:
         """Create cluster head announcement message"""
         return VANETMessage(
@@ -400,6 +526,8 @@ class MessageProcessor:
         else:
             msg_type = MessageType.DATA_BROADCAST
         
+        # One clock read for both timestamps (also skips the one in __post_init__)
+        now = time.time()
         return VANETMessage(
             message_type=msg_type,
             source_id=vehicle.id,
@@ -409,7 +537,8 @@ class MessageProcessor:
             priority=priority,
             is_emergency=is_emergency,
             position=(vehicle.x, vehicle.y),
-            data_timestamp=time.time(),
+            timestamp=now,
+            data_timestamp=now,
             sequence_number=self._get_next_sequence(vehicle.id)
         )
     
@@ -418,6 +547,7 @@ class MessageProcessor:
         """Create emergency broadcast message"""
         msg_type = MessageType.CLUSTER_EMERGENCY if cluster_id else MessageType.EMERGENCY_BROADCAST
         
+        now = time.time()
         return VANETMessage(
             message_type=msg_type,
             source_id=vehicle.id,
@@ -427,8 +557,9 @@ class MessageProcessor:
             priority=10,  # Highest priority
             is_emergency=True,
             position=(vehicle.x, vehicle.y),
-            data_timestamp=time.time(),
-            expiry_time=time.time() + 60.0,  # Emergency messages expire in 1 minute
+            timestamp=now,
+            data_timestamp=now,
+            expiry_time=now + 60.0,  # Emergency messages expire in 1 minute
             sequence_number=self._get_next_sequence(vehicle.id)
         )
     
@@ -449,28 +580,9 @@ class MessageProcessor:
         self._log_message(message)
         
         # Process based on message type
-        if message.message_type == MessageType.BEACON:
-            return self._process_beacon(message)
-        elif message.message_type == MessageType.CLUSTER_HEAD_ANNOUNCEMENT:
-            return self._process_head_announcement(message)
-        elif message.message_type == MessageType.CLUSTER_JOIN_REQUEST:
-            return self._process_join_request(message)
-        elif message.message_type == MessageType.CLUSTER_JOIN_RESPONSE:
-            return self._process_join_response(message)
-        elif message.message_type == MessageType.CLUSTER_LEAVE_NOTIFICATION:
-            return self._process_leave_notification(message)
-        elif message.message_type == MessageType.CLUSTER_HEARTBEAT:
-            return self._process_heartbeat(message)
-        elif message.message_type == MessageType.CLUSTER_HEAD_ELECTION:
-            return self._process_election_message(message)
-        elif message.message_type == MessageType.CLUSTER_HEAD_HANDOVER:
-            return self._process_handover_message(message)
-        elif message.message_type == MessageType.CLUSTER_MERGE_REQUEST:
-            return self._process_merge_request(message)
-        elif message.message_type == MessageType.CLUSTER_MERGE_RESPONSE:
-            return self._process_merge_response(message)
-        elif message.message_type == MessageType.CLUSTER_SPLIT_NOTIFICATION:
-            return self._process_split_notification(message)
+        handler = self._type_handlers.get(message.message_type)
+        if handler is not None:
+            return handler(message)
         elif message.is_emergency:
             return self._process_emergency_message(message)
         else:
@@ -478,21 +590,18 @@ class MessageProcessor:
     
     def _get_next_sequence(self, vehicle_id: str) -> int:
         """Get next sequence number for a vehicle"""
-        if vehicle_id not in self.message_sequence_counters:
-            self.message_sequence_counters[vehicle_id] = 0
-        self.message_sequence_counters[vehicle_id] += 1
-        return self.message_sequence_counters[vehicle_id]
+        counters = self.message_sequence_counters
+        counters[vehicle_id] += 1
+        return counters[vehicle_id]
     
     def _log_message(self, message: VANETMessage):
         """Log message for history tracking"""
-        if message.source_id not in self.message_history:
-            self.message_history[message.source_id] = []
-        
-        self.message_history[message.source_id].append(message)
+        history = self.message_history.get(message.source_id)
+        if history is None:
+            # Keep only recent messages; the bounded deque drops the oldest itself
+            history = self.message_history[message.source_id] = deque(maxlen=MESSAGE_HISTORY_SIZE)
         
-        # Keep only recent messages (last 100 per vehicle)
-        if len(self.message_history[message.source_id]) > 100:
-            self.message_history[message.source_id] = self.message_history[message.source_id][-100:]
+        history.append(message)
     
     def _process_beacon(self, message: VANETMessage) -> Dict[str, Any]:
         """Process beacon message"""
@@ -7,6 +7,7 @@ from src.cluster_manager import ClusterManager, ClusterHeadElectionMethod
 from src.clustering import Vehicle, Cluster
 from typing import List, Dict, Optional, Callable
 import logging
+import math
 
 class TrustAwareClusterManager(ClusterManager):
     """Enhanced cluster manager with trust-aware features"""
@@ -45,7 +46,7 @@ class TrustAwareClusterManager(ClusterManager):
     
     def _elect_cluster_head(self, cluster: Cluster, all_vehicles: List[Vehicle]) -> Optional[str]:
         """Elect the best cluster head with trust consideration"""
-        vehicle_dict = {v.id: v for v in all_vehicles}
+        vehicle_dict = self._vehicles_by_id(all_vehicles)
         
         # Get candidate vehicles (exclude malicious if configured)
         candidates = []
@@ -61,33 +62,36 @@ class TrustAwareClusterManager(ClusterManager):
         if not candidates:
             return None
         
-        # Filter candidates by minimum trust threshold
-        trusted_candidates = []
-        for candidate in candidates:
-            trust_score = self.get_trust_score(candidate.id)
-            if trust_score >= self.min_trust_threshold:
-                trusted_candidates.append(candidate)
+        # Filter candidates by minimum trust threshold (scores are reused by the election)
+        trust_scores = {candidate.id: self.get_trust_score(candidate.id) for candidate in candidates}
+        min_trust = self.min_trust_threshold
+        trusted_candidates = [candidate for candidate in candidates if trust_scores[candidate.id] >= min_trust]
         
         # If no trusted candidates, use all candidates but warn
         if not trusted_candidates:
-            self.logger.warning(f"No candidates meet trust threshold {self.min_trust_threshold} for cluster {cluster.id}")
+            self.logger.warning("No candidates meet trust threshold %s for cluster %s",
+                                self.min_trust_threshold, cluster.id)
             trusted_candidates = candidates
         
         # Use trust-aware election
         if self.head_election_method == ClusterHeadElectionMethod.WEIGHTED_COMPOSITE:
-            return self._elect_by_trust_aware_composite(trusted_candidates, cluster)
+            return self._elect_by_trust_aware_composite(trusted_candidates, cluster, trust_scores)
         else:
             # Fall back to original methods for other election types
             return super()._elect_cluster_head(cluster, all_vehicles)
     
-    def _elect_by_trust_aware_composite(self, candidates: List[Vehicle], cluster: Cluster) -> str:
+    def _elect_by_trust_aware_composite(self, candidates: List[Vehicle], cluster: Cluster,
+                                        trust_scores: Optional[Dict[str, float]] = None) -> str:
         """Elect head based on trust-aware weighted composite score"""
         best_vehicle = None
         best_score = -1
         
         for vehicle in candidates:
             # Trust score (0-1)
-            trust_score = self.get_trust_score(vehicle.id)
+            if trust_scores is not None and vehicle.id in trust_scores:
+                trust_score = trust_scores[vehicle.id]
+            else:
+                trust_score = self.get_trust_score(vehicle.id)
             
             # Connectivity score (0-1)
             neighbors = len(self.vehicle_neighbors.get(vehicle.id, set()))
@@ -98,8 +102,7 @@ class TrustAwareClusterManager(ClusterManager):
             stability_score = max(0.0, 1.0 - (mobility / 50.0))
             
             # Position score (0-1) - closer to centroid is better
-            distance = ((vehicle.x - cluster.centroid_x)**2 + 
-                       (vehicle.y - cluster.centroid_y)**2)**0.5
+            distance = math.hypot(vehicle.x - cluster.centroid_x, vehicle.y - cluster.centroid_y)
             position_score = max(0.0, 1.0 - (distance / 300.0))
             
             # Reliability score (0-1) - not malicious
@@ -115,10 +118,10 @@ class TrustAwareClusterManager(ClusterManager):
             )
             
             self.logger.debug(
-                f"Candidate {vehicle.id}: Trust={trust_score:.2f}, "
-                f"Connectivity={connectivity_score:.2f}, Stability={stability_score:.2f}, "
-                f"Position={position_score:.2f}, Reliability={reliability_score:.2f}, "
-                f"Composite={composite_score:.2f}"
+                "Candidate %s: Trust=%.2f, Connectivity=%.2f, Stability=%.2f, "
+                "Position=%.2f, Reliability=%.2f, Composite=%.2f",
+                vehicle.id, trust_score, connectivity_score, stability_score,
+                position_score, reliability_score, composite_score
             )
             
             if composite_score > best_score:
@@ -126,7 +129,7 @@ class TrustAwareClusterManager(ClusterManager):
                 best_vehicle = vehicle
         
         selected_id = best_vehicle.id if best_vehicle else candidates[0].id
-        self.logger.info(f"Trust-aware head election: {selected_id} (score: {best_score:.2f})")
+        self.logger.info("Trust-aware head election: %s (score: %.2f)", selected_id, best_score)
         return selected_id
     
     def _should_reelect_head(self, cluster_id: str, current_time: float) -> bool:
@@ -147,13 +150,15 @@ class TrustAwareClusterManager(ClusterManager):
         
         # Re-elect if current head becomes malicious
         if self.is_malicious(current_head):
-            self.logger.warning(f"Re-electing head for cluster {cluster_id}: current head {current_head} is malicious")
+            self.logger.warning("Re-electing head for cluster %s: current head %s is malicious",
+                                cluster_id, current_head)
             return True
         
         # Re-elect if current head trust drops below threshold
         head_trust = self.get_trust_score(current_head)
         if head_trust < self.min_trust_threshold:
-            self.logger.warning(f"Re-electing head for cluster {cluster_id}: head trust {head_trust:.2f} below threshold {self.min_trust_threshold}")
+            self.logger.warning("Re-electing head for cluster %s: head trust %.2f below threshold %s",
+                                cluster_id, head_trust, self.min_trust_threshold)
             return True
         
         return False
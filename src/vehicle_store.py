@@ -0,0 +1,294 @@
+"""
+Vehicle Position Store
+
+This module keeps vehicle positions in a structure-of-arrays layout (parallel
+x/y columns indexed by a dense slot per vehicle) so proximity queries such as
+"which vehicles are within radio range of this sender" can be answered with a
+few vectorized operations instead of a Python loop over every vehicle node.
+
+Vehicles are also bucketed into a uniform grid, so queries whose radius fits
+within one cell only have to look at the 3x3 block of cells around the center.
+
+Only positions are mirrored here. Speed, direction, trust and the role flags
+stay on VehicleNode, where the application and the simulators assign them
+directly; columns for them would go stale between syncs, and the reductions
+over them (e.g. trust statistics) gather the values in one pass instead.
+"""
+
+from itertools import chain
+from typing import Dict, List, Set, Tuple, Any
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    # NumPy is optional - fall back to plain Python lists
+    NUMPY_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Numba is optional - the NumPy scan is used instead
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    # Deliberately serial: hits are compacted into ``out`` in slot order, and at
+    # radio-range fleet sizes a parallel=True/prange launch costs more than the scan
+    @njit(nogil=True, cache=True)
+    def _nearby_kernel(xs, ys, n, cx, cy, r2, skip, out):
+        """Write slots within sqrt(r2) of (cx, cy) into ``out``, return the hit count"""
+        count = 0
+        for i in range(n):
+            dx = xs[i] - cx
+            dy = ys[i] - cy
+            if dx * dx + dy * dy <= r2 and i != skip:
+                out[count] = i
+                count += 1
+        return count
+
+_kernel_warm = False
+
+def _warm_up_kernel():
+    """Compile the Numba kernel once, up front, instead of on the first broadcast"""
+    global _kernel_warm
+    if _kernel_warm:
+        return
+    coords = np.zeros(1, dtype=np.float64)
+    _nearby_kernel(coords, coords, 1, 0.0, 0.0, 1.0, -1, np.empty(1, dtype=np.intp))
+    _kernel_warm = True
+
+class VehicleStore:
+    """Structure-of-arrays cache of vehicle positions"""
+
+    def __init__(self, initial_capacity: int = 64, cell_size: float = 300.0):
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+
+        # Uniform grid: cell -> vehicle IDs, plus the current cell of each vehicle
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], Set[str]] = {}
+        self.cell_of: Dict[str, Tuple[int, int]] = {}
+
+        if NUMPY_AVAILABLE:
+            self.xs = np.empty(initial_capacity, dtype=np.float64)
+            self.ys = np.empty(initial_capacity, dtype=np.float64)
+            # Reusable output buffer for the Numba kernel
+            self.hit_buf = np.empty(initial_capacity, dtype=np.intp)
+            if NUMBA_AVAILABLE:
+                _warm_up_kernel()
+        else:
+            self.xs: List[float] = []
+            self.ys: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, vehicle_id: str) -> bool:
+        return vehicle_id in self.index
+
+    def add(self, vehicle_id: str, x: float, y: float):
+        """Add a vehicle (or update it if it is already tracked)"""
+        if vehicle_id in self.index:
+            self.update(vehicle_id, x, y)
+            return
+
+        slot = len(self.ids)
+        if NUMPY_AVAILABLE:
+            if slot == self.xs.shape[0]:
+                self._grow()
+            self.xs[slot] = x
+            self.ys[slot] = y
+        else:
+            self.xs.append(x)
+            self.ys.append(y)
+
+        self.ids.append(vehicle_id)
+        self.index[vehicle_id] = slot
+        self._place(vehicle_id, x, y)
+
+    def update(self, vehicle_id: str, x: float, y: float):
+        """Update the position of a tracked vehicle"""
+        slot = self.index.get(vehicle_id)
+        if slot is None:
+            self.add(vehicle_id, x, y)
+            return
+
+        self.xs[slot] = x
+        self.ys[slot] = y
+        self._place(vehicle_id, x, y)
+
+    def remove(self, vehicle_id: str):
+        """Remove a vehicle, moving the last slot into the freed one"""
+        slot = self.index.pop(vehicle_id, None)
+        if slot is None:
+            return
+
+        cell = self.cell_of.pop(vehicle_id)
+        self._discard_from_cell(cell, vehicle_id)
+
+        last = len(self.ids) - 1
+        if slot != last:
+            moved_id = self.ids[last]
+            self.ids[slot] = moved_id
+            self.index[moved_id] = slot
+            self.xs[slot] = self.xs[last]
+            self.ys[slot] = self.ys[last]
+
+        self.ids.pop()
+        if not NUMPY_AVAILABLE:
+            self.xs.pop()
+            self.ys.pop()
+
+    def sync(self, vehicle_nodes: Dict[str, Any]):
+        """Refresh positions from vehicle nodes (picks up direct ``node.location`` writes)"""
+        if len(vehicle_nodes) != len(self.ids) or any(vid not in self.index for vid in vehicle_nodes):
+            self.rebuild(vehicle_nodes)
+            return
+
+        ids = self.ids
+        locations = [vehicle_nodes[vehicle_id].location for vehicle_id in ids]
+        if not NUMPY_AVAILABLE:
+            self.xs = [x for x, _ in locations]
+            self.ys = [y for _, y in locations]
+            for vehicle_id, (x, y) in zip(ids, locations):
+                self._place(vehicle_id, x, y)
+            return
+
+        # One bulk write per column instead of a NumPy scalar store per vehicle
+        count = len(ids)
+        coords = np.fromiter(chain.from_iterable(locations), dtype=np.float64,
+                             count=2 * count).reshape(count, 2)
+        size = self.cell_size
+        old_cols = self.xs[:count] // size
+        old_rows = self.ys[:count] // size
+        self.xs[:count] = coords[:, 0]
+        self.ys[:count] = coords[:, 1]
+
+        # Only vehicles that crossed a cell boundary need their grid bucket moved
+        moved = np.flatnonzero((self.xs[:count] // size != old_cols) |
+                               (self.ys[:count] // size != old_rows))
+        for slot in moved.tolist():
+            x, y = locations[slot]
+            self._place(ids[slot], x, y)
+
+    def rebuild(self, vehicle_nodes: Dict[str, Any]):
+        """Rebuild the store from scratch"""
+        self.ids = []
+        self.index = {}
+        self.cells = {}
+        self.cell_of = {}
+        if not NUMPY_AVAILABLE:
+            self.xs = []
+            self.ys = []
+
+        for vehicle_id, node in vehicle_nodes.items():
+            x, y = node.location
+            self.add(vehicle_id, x, y)
+
+    def get_position(self, vehicle_id: str) -> Tuple[float, float]:
+        """Get the stored position of a vehicle"""
+        slot = self.index[vehicle_id]
+        return float(self.xs[slot]), float(self.ys[slot])
+
+    def neighbor_ids_within(self, cx: float, cy: float, r: float,
+                            exclude: str = None) -> List[str]:
+        """Get IDs of all vehicles within distance ``r`` of ``(cx, cy)``
+
+        Compares squared distances, so no square root is taken. The vehicle
+        ``exclude`` (typically the sender) is left out of the result.
+        """
+        count = len(self.ids)
+        if count == 0:
+            return []
+
+        r2 = r * r
+        ids = self.ids
+        skip = self.index.get(exclude, -1) if exclude is not None else -1
+
+        if r <= self.cell_size:
+            # Everything within r lies in the 3x3 block of cells around the center
+            slots = self._candidate_slots(cx, cy)
+            if not slots:
+                return []
+        else:
+            slots = None
+
+        if NUMPY_AVAILABLE:
+            if slots is None and NUMBA_AVAILABLE:
+                hit_count = _nearby_kernel(self.xs, self.ys, count, cx, cy, r2, skip, self.hit_buf)
+                return [ids[slot] for slot in self.hit_buf[:hit_count].tolist()]
+            if slots is None:
+                dx = self.xs[:count] - cx
+                dy = self.ys[:count] - cy
+                mask = dx * dx + dy * dy <= r2
+                if skip >= 0:
+                    mask[skip] = False
+                hits = np.flatnonzero(mask)
+            else:
+                candidates = np.array(slots, dtype=np.intp)
+                dx = self.xs[candidates] - cx
+                dy = self.ys[candidates] - cy
+                mask = dx * dx + dy * dy <= r2
+                hits = candidates[mask]
+                # Slot order keeps results independent of set iteration order
+                hits.sort()
+            return [ids[slot] for slot in hits.tolist() if slot != skip]
+
+        xs, ys = self.xs, self.ys
+        neighbors = []
+        for slot in (range(count) if slots is None else sorted(slots)):
+            if slot == skip:
+                continue
+            dx = xs[slot] - cx
+            dy = ys[slot] - cy
+            if dx * dx + dy * dy <= r2:
+                neighbors.append(ids[slot])
+        return neighbors
+
+    def _candidate_slots(self, cx: float, cy: float) -> List[int]:
+        """Get slots of the vehicles in the 3x3 block of cells around a position"""
+        slot_of = self.index.__getitem__
+        cell_members = self.cells.get
+        col, row = self._cell(cx, cy)
+        slots = []
+        for i in (col - 1, col, col + 1):
+            for j in (row - 1, row, row + 1):
+                members = cell_members((i, j))
+                if members:
+                    # map() resolves the slots without a generator frame per cell
+                    slots.extend(map(slot_of, members))
+        return slots
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        """Get the grid cell containing a position"""
+        size = self.cell_size
+        return int(x // size), int(y // size)
+
+    def _place(self, vehicle_id: str, x: float, y: float):
+        """Move a vehicle into the grid cell for its position"""
+        cell = self._cell(x, y)
+        old = self.cell_of.get(vehicle_id)
+        if old == cell:
+            return
+
+        if old is not None:
+            self._discard_from_cell(old, vehicle_id)
+        self.cells.setdefault(cell, set()).add(vehicle_id)
+        self.cell_of[vehicle_id] = cell
+
+    def _discard_from_cell(self, cell: Tuple[int, int], vehicle_id: str):
+        """Remove a vehicle from a grid cell, dropping the cell once empty"""
+        members = self.cells[cell]
+        members.discard(vehicle_id)
+        if not members:
+            del self.cells[cell]
+
+    def _grow(self):
+        """Double the capacity of the coordinate columns"""
+        capacity = max(1, self.xs.shape[0]) * 2
+        for name in ('xs', 'ys', 'hit_buf'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:old.shape[0]] = old
+            setattr(self, name, new)
@@ -2,8 +2,13 @@
 Test cases for custom VANET application
 """
 
+import json
+import sys
+
 import pytest
 from src.custom_vanet_appl import CustomVANETApplication, MessageType
+from src.message_processor import VANETMessage, MessageType as VANETMessageType
+from src.cluster_manager import ClusterState
 import traci
 
 @pytest.fixture
@@ -94,4 +99,255 @@ def test_message_queue_management(app):
     
     assert message_id in app.message_queue
     assert app.message_queue[message_id]["source"] == "vehicle_1"
-    assert app.message_queue[message_id]["destination"] == "vehicle_2"
\ No newline at end of file
+    assert app.message_queue[message_id]["destination"] == "vehicle_2"
+
+def test_cluster_update_skipped_when_unchanged(app):
+    """Test cluster formation is only recomputed after a material state change"""
+    app.initialize()
+    app.add_vehicle("vehicle_1", 0.0, 0.0, 20.0, 0.0)
+    app.add_vehicle("vehicle_2", 50.0, 0.0, 20.0, 0.0)
+    calls = []
+    engine = app.clustering_engine
+    original_update = engine.update_vehicles
+    engine.update_vehicles = lambda vehicles: (calls.append(app.current_time), original_update(vehicles))[1]
+
+    app.handle_timeStep(5.0)
+    app.update_vehicle("vehicle_1", 1.0, 0.0, 20.0, 0.0)  # Below movement threshold
+    app.update_vehicle("vehicle_2", 51.0, 0.0, 20.0, 0.0)
+    app.handle_timeStep(10.0)
+    app.update_vehicle("vehicle_2", 150.0, 0.0, 20.0, 0.0)
+    app.handle_timeStep(15.0)
+
+    assert calls == [5.0, 15.0]
+    assert app.last_cluster_update == 15.0
+
+def test_static_fleet_cluster_management_progresses(app):
+    """Test re-election and state changes still happen when no vehicle moves"""
+    app.initialize()
+    for i in range(6):
+        app.add_vehicle(f"vehicle_{i}", 20.0 * i, 0.0, 20.0, 0.0)
+
+    manager = app.cluster_manager
+    states = set()
+    for step in range(1, 81):
+        for i in range(6):
+            app.update_vehicle(f"vehicle_{i}", 20.0 * i, 0.0, 20.0, 0.0)  # Parked in place
+        app.handle_timeStep(5.0 * step)
+        states.update(manager.cluster_states.values())
+
+    assert any(election_time > 5.0 for election_time in manager.cluster_head_election_times.values())
+    assert ClusterState.DISSOLVING in states
+
+def test_cluster_member_index(app):
+    """Test cluster-addressed delivery follows the member index"""
+    app.initialize()
+    for i in range(3):
+        app.add_vehicle(f"vehicle_{i}", 10.0 * i, 0.0, 20.0, 0.0)
+    app._set_cluster_id(app.vehicle_nodes["vehicle_0"], "cluster_a")
+    app._set_cluster_id(app.vehicle_nodes["vehicle_1"], "cluster_a")
+    app.vehicle_nodes["vehicle_2"].cluster_id = "cluster_a"  # Direct write, picked up by sync
+    app._sync_cluster_members()
+
+    assert app._cluster_members["cluster_a"].keys() == {"vehicle_0", "vehicle_1", "vehicle_2"}
+
+    app.remove_vehicle("vehicle_1")
+    assert list(app._cluster_members["cluster_a"]) == ["vehicle_0", "vehicle_2"]
+
+    # The index must match a full scan of the nodes' cluster ids
+    expected = {vid for vid, node in app.vehicle_nodes.items() if node.cluster_id == "cluster_a"}
+    assert set(app._cluster_members["cluster_a"]) == expected
+
+
+def test_clustering_messages_route_to_cluster_members(app):
+    """Test clustering messages with a cluster id reach only that cluster's members"""
+    app.initialize()
+    for i in range(4):
+        app.add_vehicle(f"vehicle_{i}", 10.0 * i, 0.0, 20.0, 0.0)  # All within radio range
+    app._set_cluster_id(app.vehicle_nodes["vehicle_0"], "cluster_a")
+    app._set_cluster_id(app.vehicle_nodes["vehicle_2"], "cluster_a")
+    app._set_cluster_id(app.vehicle_nodes["vehicle_3"], "cluster_b")
+
+    heartbeat = VANETMessage(message_type=VANETMessageType.CLUSTER_HEARTBEAT, source_id="vehicle_0",
+                             cluster_id="cluster_a", timestamp=1.0)
+    app._route_message_to_vehicles(heartbeat, heartbeat.to_dict())
+    received = {vid for vid, node in app.vehicle_nodes.items() if node.message_buffer}
+    assert received == {"vehicle_2"}
+
+    # Without a cluster id the message falls back to every vehicle in range
+    heartbeat = VANETMessage(message_type=VANETMessageType.CLUSTER_HEARTBEAT, source_id="vehicle_0",
+                             timestamp=1.0)
+    app._route_message_to_vehicles(heartbeat, heartbeat.to_dict())
+    received = {vid for vid, node in app.vehicle_nodes.items() if node.message_buffer}
+    assert received == {"vehicle_1", "vehicle_2", "vehicle_3"}
+
+def test_cluster_delivery_follows_join_order(app):
+    """Test cluster-routed messages reach members in the order they joined"""
+    app.initialize()
+    for i in range(4):
+        app.add_vehicle(f"vehicle_{i}", 10.0 * i, 0.0, 20.0, 0.0)
+    for vehicle_id in ("vehicle_0", "vehicle_3", "vehicle_1", "vehicle_2"):
+        app._set_cluster_id(app.vehicle_nodes[vehicle_id], "cluster_a")
+
+    delivered = []
+    app._deliver_messages_to_vehicle = lambda deliveries, vehicle_id: delivered.append(vehicle_id)
+    announcement = VANETMessage(message_type=VANETMessageType.CLUSTER_HEAD_ANNOUNCEMENT,
+                                source_id="vehicle_0", cluster_id="cluster_a", timestamp=1.0)
+    app._route_message_to_vehicles(announcement, announcement.to_dict())
+    assert delivered == ["vehicle_3", "vehicle_1", "vehicle_2"]
+
+def test_delivered_beacon_updates_receiver_neighbors(app):
+    """Test a queued beacon adds its sender to the receiver's neighbors"""
+    app.initialize()
+    app.add_vehicle("vehicle_1", 0.0, 0.0, 20.0, 0.0)
+    app.add_vehicle("vehicle_2", 50.0, 0.0, 20.0, 0.0)
+    app.add_vehicle("vehicle_3", 1000.0, 0.0, 20.0, 0.0)  # Out of range
+
+    for step in range(1, 4):
+        app.handle_timeStep(0.5 * step)
+
+    assert "vehicle_1" in app.vehicle_nodes["vehicle_2"].neighbors
+    assert "vehicle_2" in app.vehicle_nodes["vehicle_1"].neighbors
+    assert not app.vehicle_nodes["vehicle_3"].neighbors
+
+def test_cleanup_removes_only_timed_out_vehicles(app):
+    """Test timeout cleanup honours refreshes, including direct last_update writes"""
+    app.initialize()
+    for i in range(3):
+        app.add_vehicle(f"vehicle_{i}", 1000.0 * i, 0.0, 20.0, 0.0)
+
+    app.current_time = 8.0
+    app.update_vehicle("vehicle_1", 1000.0, 0.0, 20.0, 0.0)
+    app.vehicle_nodes["vehicle_2"].last_update = 8.0
+
+    app.current_time = 12.0
+    app._cleanup_old_data()
+    assert sorted(app.vehicle_nodes) == ["vehicle_1", "vehicle_2"]
+
+    app.current_time = 19.0
+    app._cleanup_old_data()
+    assert not app.vehicle_nodes
+
+def test_cleanup_heap_stays_bounded(app):
+    """Test repeated updates don't grow the cleanup heap without limit"""
+    app.initialize()
+    app.add_vehicle("vehicle_1", 0.0, 0.0, 20.0, 0.0)
+    for step in range(1, 500):
+        app.current_time = step * 0.01
+        app.update_vehicle("vehicle_1", step, 0.0, 20.0, 0.0)
+
+    assert len(app._update_heap) <= 4 * (1 + 16)
+    app.current_time = 15.0
+    app._cleanup_old_data()
+    assert "vehicle_1" not in app.vehicle_nodes
+
+def test_message_buffer_is_bounded(app):
+    """Test message buffers evict the oldest entries and follow config changes"""
+    app.initialize()
+    app.add_vehicle("vehicle_1", 0.0, 0.0, 20.0, 0.0)
+    buffer = app.vehicle_nodes["vehicle_1"].message_buffer
+    assert buffer.maxlen == app.config['max_message_buffer_size']
+
+    buffer.extend(range(150))
+    assert list(buffer)[0] == 50
+
+    app.set_configuration({'max_message_buffer_size': 10})
+    assert list(app.vehicle_nodes["vehicle_1"].message_buffer) == list(range(140, 150))
+
+def test_application_statistics_are_fresh(app):
+    """Test each statistics call reflects current state and shares no nested dicts"""
+    app.initialize()
+    app.add_vehicle("vehicle_1", 0.0, 0.0, 20.0, 0.0)
+
+    first = app.get_application_statistics()
+    first['application']['total_vehicles'] = 99
+    assert app.get_application_statistics()['application']['total_vehicles'] == 1
+
+    app.add_vehicle("vehicle_2", 50.0, 0.0, 20.0, 0.0)
+    assert app.get_application_statistics()['application']['total_vehicles'] == 2
+
+def test_trust_decay_only_for_inactive_vehicles(app):
+    """Test trust decay skips recently updated vehicles"""
+    app.initialize()
+    app.config['neighbor_timeout'] = 10000.0
+    app.add_vehicle("vehicle_1", 0.0, 0.0, 20.0, 0.0)
+    app.current_time = 3600.0
+    app.add_vehicle("vehicle_2", 50.0, 0.0, 20.0, 0.0)
+
+    app.apply_trust_decay()
+
+    assert app.vehicle_nodes["vehicle_1"].trust_score == pytest.approx(1 - app.trust_decay_rate)
+    assert app.vehicle_nodes["vehicle_2"].trust_score == 1.0
+
+def test_periodic_tasks_fire_on_interval(app):
+    """Test beacons still go out once per interval when checks are skipped between"""
+    app.initialize()
+    app.add_vehicle("vehicle_1", 0.0, 0.0, 20.0, 0.0)
+    beacon_times = []
+    original_send = app._send_beacons
+    app._send_beacons = lambda: (beacon_times.append(app.current_time), original_send())
+
+    for step in range(1, 31):
+        app.handle_timeStep(step * 0.1)
+
+    assert beacon_times == pytest.approx([1.0, 2.0, 3.0])
+    assert app.last_cluster_update == 0.0
+
+def test_unchanged_beacons_suppressed_until_keepalive(app):
+    """Test change-only beaconing skips repeats but still sends keepalives"""
+    app.initialize()
+    app.config['suppress_unchanged_beacons'] = True
+    app.config['beacon_keepalive_interval'] = 3.0
+    app.add_vehicle("vehicle_1", 0.0, 0.0, 20.0, 0.0)
+    app.add_vehicle("vehicle_2", 50.0, 0.0, 20.0, 0.0)
+
+    sent = []
+    for step in range(5):
+        app.current_time = float(step)
+        if step == 2:
+            app.update_vehicle("vehicle_2", 60.0, 0.0, 20.0, 0.0)
+        before = app.statistics['messages_sent']
+        app._send_beacons()
+        sent.append(app.statistics['messages_sent'] - before)
+
+    assert sent == [2, 0, 1, 1, 0]
+
+def test_receive_message_rejects_malformed_input(app):
+    """Test malformed messages are counted and dropped instead of raising"""
+    app.initialize()
+    app.receive_message({"source_id": "vehicle_1"})
+    app.receive_message({"message_type": "not_a_type", "source_id": "vehicle_1",
+                         "cluster_state": "undefined", "join_response_code": 0,
+                         "merge_response_code": 0})
+
+    assert app._bad_message_count == 2
+
+def test_receive_message_rejects_non_dict_payload(app):
+    """Test non-dict payloads are counted and dropped instead of raising"""
+    app.initialize()
+    for payload in (None, 5, "BEACON", ["source_id"]):
+        app.receive_message(payload)
+
+    assert app._bad_message_count == 4
+
+def test_message_from_json_round_trip():
+    """Test messages decoded from JSON round-trip with their ids interned"""
+    message = VANETMessage(message_type=VANETMessageType.CLUSTER_HEARTBEAT, source_id="vehicle_1",
+                           cluster_id="cluster_a", member_list=["vehicle_2"], timestamp=5.0)
+    data = json.loads(json.dumps(message.to_dict()))
+
+    parsed = VANETMessage.from_dict(data)
+    assert parsed.message_type is VANETMessageType.CLUSTER_HEARTBEAT
+    assert parsed.member_list == ["vehicle_2"]
+    assert parsed.timestamp == 5.0
+    assert parsed.source_id is sys.intern("vehicle_1")
+    assert parsed.cluster_id is sys.intern("cluster_a")
+
+def test_message_json_bytes_round_trip():
+    """Test the wire encoding decodes back to the same message fields"""
+    message = VANETMessage(message_type=VANETMessageType.CLUSTER_JOIN_REQUEST, source_id="vehicle_1",
+                           neighbor_ids=["vehicle_2", "vehicle_3"], timestamp=7.5)
+    payload = message.to_json_bytes()
+    assert isinstance(payload, bytes)
+
+    parsed = VANETMessage.from_json_bytes(payload)
+    assert parsed.to_dict() == json.loads(payload)
@@ -0,0 +1,79 @@
+"""
+Test cases for the SoA vehicle position store
+"""
+
+import pytest
+from src import vehicle_store
+from src.vehicle_store import VehicleStore
+
+@pytest.fixture(params=["numba", "numpy", "pure_python"])
+def store(request, monkeypatch):
+    if request.param == "numba" and not vehicle_store.NUMBA_AVAILABLE:
+        pytest.skip("Numba not available")
+    if request.param != "pure_python" and not vehicle_store.NUMPY_AVAILABLE:
+        pytest.skip("NumPy not available")
+    monkeypatch.setattr(vehicle_store, "NUMPY_AVAILABLE", request.param != "pure_python")
+    monkeypatch.setattr(vehicle_store, "NUMBA_AVAILABLE", request.param == "numba")
+    return VehicleStore(initial_capacity=2)
+
+def test_neighbor_ids_within(store):
+    """Test range query uses an inclusive radius"""
+    store.add("v1", 0.0, 0.0)
+    store.add("v2", 300.0, 0.0)
+    store.add("v3", 200.0, 250.0)
+    store.add("v4", 10.0, 10.0)
+
+    assert sorted(store.neighbor_ids_within(0.0, 0.0, 300.0)) == ["v1", "v2", "v4"]
+    assert store.neighbor_ids_within(1000.0, 1000.0, 300.0) == []
+
+def test_update_and_remove(store):
+    """Test position updates and swap-removal keep the index consistent"""
+    for i in range(5):
+        store.add(f"v{i}", 100.0 * i, 0.0)
+
+    store.update("v4", 0.0, 5.0)
+    store.remove("v1")
+
+    assert len(store) == 4
+    assert "v1" not in store
+    assert store.get_position("v4") == (0.0, 5.0)
+    assert sorted(store.neighbor_ids_within(0.0, 0.0, 50.0)) == ["v0", "v4"]
+
+def test_grid_tracks_moves_across_cells(store):
+    """Test grid buckets follow vehicles and match the full scan"""
+    store.add("v1", 0.0, 0.0)
+    store.add("v2", 250.0, 0.0)
+    store.add("v3", 900.0, 900.0)
+
+    store.update("v3", 100.0, 50.0)
+    store.update("v2", 1500.0, 0.0)
+
+    assert store.cell_of["v3"] == (0, 0)
+    assert store.neighbor_ids_within(0.0, 0.0, 200.0) == ["v1", "v3"]
+    # Radius larger than a cell falls back to the full scan
+    assert store.neighbor_ids_within(0.0, 0.0, 1600.0) == ["v1", "v2", "v3"]
+
+def test_neighbor_ids_within_excludes_sender(store):
+    """Test the excluded vehicle is masked out on both query paths"""
+    store.add("v1", 0.0, 0.0)
+    store.add("v2", 100.0, 0.0)
+
+    assert store.neighbor_ids_within(0.0, 0.0, 300.0, exclude="v1") == ["v2"]
+    assert store.neighbor_ids_within(0.0, 0.0, 1000.0, exclude="v1") == ["v2"]
+    assert store.neighbor_ids_within(0.0, 0.0, 300.0, exclude="unknown") == ["v1", "v2"]
+
+def test_sync_picks_up_direct_location_writes(store):
+    """Test sync refreshes positions and grid cells from the vehicle nodes"""
+    class Node:
+        def __init__(self, x, y):
+            self.location = (x, y)
+
+    nodes = {"v1": Node(0.0, 0.0), "v2": Node(100.0, 0.0), "v3": Node(700.0, 0.0)}
+    store.rebuild(nodes)
+    nodes["v2"].location = (50.0, 10.0)  # Same cell
+    nodes["v3"].location = (120.0, 0.0)  # Crosses into the first cell
+    store.sync(nodes)
+
+    assert store.get_position("v2") == (50.0, 10.0)
+    assert store.cell_of["v3"] == (0, 0)
+    assert store.neighbor_ids_within(0.0, 0.0, 150.0) == ["v1", "v2", "v3"]